@@ -0,0 +1,108 @@
+# benchmarks/startup_benchmark.py
+"""
+Measures how long `python main.py` takes before the first menu can be shown: importing main and building
+its Catalog("topics.json"), once with a cold catalog cache (compiled and validated from topics.json) and once
+with a warm one. Wall clock time is taken inside a fresh interpreter, `python -X importtime` lists the slowest imports.
+Fails (exit code 1) when the median cold or warm startup goes over the budget, so a heavy import or a slower catalog
+sneaking back into the startup path is caught early.
+
+Usage:
+    python benchmarks/startup_benchmark.py                 # 5 runs, 180 ms budget
+    python benchmarks/startup_benchmark.py --runs 10 --budget-ms 120 --top 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Same work main.py does before printing the first menu: import everything and load the catalog.
+# The catalog cache lives in a scratch file, so the benchmark never touches the real .cache/catalog.json
+STARTUP_CODE = "import main; main.Catalog('topics.json', cache_file={cache_file!r})"
+TIMED_CODE = "import time; _start = time.perf_counter(); {startup}; print(time.perf_counter() - _start)"
+
+
+def run_wall_clock(cache_file: Path)-> float:
+    """
+    Runs the startup code once in a fresh interpreter.
+    Returns the seconds spent between the first import of main and the built catalog.
+    """
+    code = TIMED_CODE.format(startup=STARTUP_CODE.format(cache_file=str(cache_file)))
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def run_importtime(cache_file: Path)-> Tuple[int, Dict[str, int]]:
+    """
+    Runs the startup code once in a fresh interpreter with -X importtime.
+    Returns the cumulative import time of main (microseconds) and the self time of every imported module.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE.format(cache_file=str(cache_file))],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    main_cumulative = 0
+    self_times: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        self_times[module] = int(self_us)
+        if module == "main":
+            main_cumulative = int(cumulative_us)
+    return main_cumulative, self_times
+
+
+def _summary(times_ms: List[float])-> str:
+    return f"median {statistics.median(times_ms):.1f} ms, min {min(times_ms):.1f} ms, max {max(times_ms):.1f} ms"
+
+
+def main(argv: List[str] = None)-> int:
+    parser = argparse.ArgumentParser(description="Startup benchmark for main.py (imports and catalog)")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreter runs (default: 5)")
+    parser.add_argument("--budget-ms", type=float, default=180.0, help="maximum allowed median startup time, cold or warm catalog cache")
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest modules to list")
+    args = parser.parse_args(argv)
+
+    cold, warm, imports = [], [], []
+    self_times: Dict[str, List[int]] = {}
+    with tempfile.TemporaryDirectory(prefix="startup_benchmark_") as scratch_dir:
+        warm_cache = Path(scratch_dir) / "warm_catalog.json"
+        run_wall_clock(warm_cache)  # compiles the catalog once, the warm runs load it
+        for run in range(args.runs):
+            cold.append(run_wall_clock(Path(scratch_dir) / f"cold_catalog_{run}.json") * 1000)
+            warm.append(run_wall_clock(warm_cache) * 1000)
+            total, modules = run_importtime(warm_cache)
+            imports.append(total / 1000)
+            for module, us in modules.items():
+                self_times.setdefault(module, []).append(us)
+
+    print(f"Startup over {args.runs} runs (import main + Catalog('topics.json')), budget {args.budget_ms:.0f} ms:")
+    print(f"  warm catalog cache: {_summary(warm)}")
+    print(f"  cold catalog cache: {_summary(cold)}")
+    print(f"  main.py import time: {_summary(imports)}")
+    print(f"\nSlowest modules (median self time):")
+    slowest = sorted(self_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]
+    for module, times in slowest:
+        print(f"  {statistics.median(times) / 1000:7.2f} ms  {module}")
+
+    for heavy in ("playwright", "rich.markdown", "rich.syntax", "pygments", "markdown_it"):
+        if heavy in self_times:
+            print(f"\n❌ '{heavy}' is imported at startup, it should only be loaded on first use.")
+            return 1
+    for cache, times in (("cold", cold), ("warm", warm)):
+        median_ms = statistics.median(times)
+        if median_ms > args.budget_ms:
+            print(f"\n❌ Startup regressed: {median_ms:.1f} ms with a {cache} catalog cache is over the {args.budget_ms:.0f} ms budget.")
+            return 1
+    print("\n✅ Startup is within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
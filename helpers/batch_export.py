@@ -0,0 +1,235 @@
+# helpers/batch_export.py
+
+import contextlib
+import importlib
+import io
+import os
+import signal
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from rich.console import Console
+from . import display_utils
+from .catalog import PROJECT_ROOT, Catalog
+from .custom_terminal_themes import get_terminal_theme
+from .document import capture_document
+from .export_manifest import ExportManifest, compute_fingerprint, find_module_file
+from .html_stream import write_gzip_sibling, write_shared_stylesheet
+from .pdf_writer import write_pdf
+
+EXPORT_WIDTH = 140  # wide enough for the 136 column heading panels used by display_utils
+SHARED_CSS_DIR = PROJECT_ROOT / "topics" / "Notes" / "css"  # one stylesheet per theme for every compact page
+EXPORT_TIMEOUT = 300.0  # seconds one topic may take to render and export before its worker gives up on it
+
+
+def get_notes_paths(module_file: str, module_name: Optional[str] = None) -> Tuple[Path, Path]:
+    """
+    Returns (html_filepath, pdf_filepath) inside the Notes folder next to the topic module, creating the folders.
+    Args:
+        module_file (str): __file__ of the topic module
+        module_name (str): file name to use for the notes, defaults to the module file name
+    """
+    module_path = Path(module_file)
+    notes_dir = module_path.parent / "Notes"
+    html_dir = notes_dir / "HTMLs"
+    pdf_dir = notes_dir / "PDFs"
+    html_dir.mkdir(parents=True, exist_ok=True)
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+    name = module_name or module_path.stem  # Gets the filename without the .py extension
+    return html_dir / f"{name}.html", pdf_dir / f"{name}.pdf"
+
+
+def get_shared_stylesheet_path(theme_name: str) -> Path:
+    """Path of the minified stylesheet shared by the compact HTML notes of a theme."""
+    return SHARED_CSS_DIR / f"{theme_name}.css"
+
+
+def _failed_result(module: str, error: str) -> Dict:
+    return {"module": module, "render": 0.0, "html": 0.0, "pdf": 0.0, "status": "failed", "error": error, "artifacts": {}, "css_rules": {}}
+
+
+def _export_module_worker(module: str, theme_name: str, make_pdf: bool, compact: bool = False, gzip: bool = False,
+                          pdf_engine: str = "chromium", live_snippets: bool = False, timeout: Optional[float] = EXPORT_TIMEOUT) -> Dict:
+    """
+    Runs in a worker process: renders one topic into its own recording console and writes its HTML (and PDF).
+    Returns a dict with the timings of every step, the error message, if any, and the css rules of a compact page
+    (merged into the shared stylesheet by the parent, so workers never write the same file).
+    With pdf_engine="builtin" the lesson is also captured as a document and laid out by helpers.pdf_writer,
+    Chromium is only used when that fails. A topic still running after `timeout` seconds fails with a TimeoutError
+    (where SIGALRM exists), the worker process then serves the next topic.
+    """
+    result = {"module": module, "render": 0.0, "html": 0.0, "pdf": 0.0, "status": "ok", "error": "", "artifacts": {}, "css_rules": {}}
+    def timed_out(signum, frame):
+        raise TimeoutError(f"took longer than {timeout:g}s")
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, timed_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    # Each worker gets its own console, nothing is shown on screen and nothing leaks between topics
+    display_utils.console = Console(record=True, file=io.StringIO(), width=EXPORT_WIDTH, force_terminal=True)
+    display_utils.LIVE_SNIPPETS = live_snippets
+    display_utils.OFFSCREEN_RENDER = True
+    scope = display_utils.recording_scope(module)
+    cwd = os.getcwd()
+    try:
+        start = time.perf_counter()
+        # Topics create and delete demo files (sample_data.txt, ...) in the working directory,
+        # so each one runs in a scratch folder to keep parallel workers from racing on them
+        with tempfile.TemporaryDirectory(prefix="topic_export_") as scratch_dir, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(scratch_dir)
+            try:
+                mod = importlib.import_module(module)
+                with scope, capture_document(module, echo=True) as document:  # echo: the scope still records the output
+                    mod.main()
+            finally:
+                os.chdir(cwd)
+        result["render"] = time.perf_counter() - start
+
+        if mod.__file__ is None:
+            raise RuntimeError(f"Module {module} does not have a __file__ attribute.")
+        html_filepath, pdf_filepath = get_notes_paths(mod.__file__)
+
+        start = time.perf_counter()
+        stylesheet_path = get_shared_stylesheet_path(theme_name) if compact else None
+        result["css_rules"] = display_utils.export_output_to_html(theme_name, str(html_filepath), scope=scope, stylesheet_path=stylesheet_path,
+                                                                  update_stylesheet=False, gzip=gzip, raise_errors=True)
+        result["html"] = time.perf_counter() - start
+        result["artifacts"]["html"] = str(html_filepath)
+        if compact:
+            result["artifacts"]["css"] = str(stylesheet_path)
+
+        if make_pdf:
+            start = time.perf_counter()
+            written = False
+            if pdf_engine == "builtin":
+                try:
+                    write_pdf(document, str(pdf_filepath), theme_name)
+                    written = True
+                except Exception:
+                    written = False  # Playwright is the high fidelity fallback
+            if not written:
+                import asyncio
+                asyncio.run(display_utils.create_pdf_from_html(str(html_filepath), str(pdf_filepath), raise_errors=True))
+            result["pdf"] = time.perf_counter() - start
+            result["artifacts"]["pdf"] = str(pdf_filepath)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        scope.close()
+    return result
+
+
+def export_all(topics_file: str = "topics.json", jobs: Optional[int] = None, theme_name: str = "fruity", make_pdf: bool = True, force: bool = False,
+               compact: bool = False, gzip: bool = False, pdf_engine: str = "chromium", live_snippets: bool = False,
+               timeout: Optional[float] = EXPORT_TIMEOUT) -> List[Dict]:
+    """
+    Exports the notes of every module listed in topics.json without any prompt, one worker process per topic.
+    Topics whose inputs did not change since the last export (see helpers.export_manifest) are skipped.
+    A topic whose worker process dies (segfault, out of memory kill) is reported as failed, the topics that were
+    still pending in the broken pool are exported again, one process each.
+    Prints a per-module timing summary at the end and returns the collected results.
+    Args:
+        topics_file (str): path of the topics.json catalog
+        jobs (int): number of worker processes, defaults to the number of CPUs
+        theme_name (str): terminal theme used for the HTML export
+        make_pdf (bool): convert every HTML file to PDF as well
+        force (bool): export every topic even if its notes are up to date
+        compact (bool): short class names and one shared stylesheet per theme instead of styles in every page
+        gzip (bool): also write pre-compressed .html.gz files
+        pdf_engine (str): "chromium" prints the HTML with Playwright, "builtin" lays the lesson out without a browser
+        live_snippets (bool): show the real output of the code examples (see helpers.snippet_runner)
+        timeout (float): seconds each topic may take, None for no limit
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed  # not needed by the interactive menu
+    from concurrent.futures.process import BrokenProcessPool
+
+    catalog = Catalog(topics_file)
+    modules = [node["module"] for node in catalog.iter_modules() if not node["issue"]]
+    invalid = [node for node in catalog.iter_modules() if node["issue"]]
+    jobs = jobs or os.cpu_count() or 1
+    console = display_utils.console
+    artifact_kinds = ["html", "pdf"] if make_pdf else ["html"]
+    if compact:
+        artifact_kinds.append("css")
+    variant = ",".join(option for option, used in [(f"compact={compact},gzip={gzip}", compact or gzip),
+                                                   (f"pdf={pdf_engine}", make_pdf and pdf_engine != "chromium"),
+                                                   ("live", live_snippets)] if used)
+    # with the default options only the width tells these notes apart from a menu export of the same topic
+
+    manifest = ExportManifest()
+    fingerprints, stale, skipped = {}, [], []
+    for module in modules:
+        module_file = find_module_file(module)
+        if module_file is not None:
+            fingerprints[module] = compute_fingerprint(module_file, theme_name, EXPORT_WIDTH, variant)
+        if not force and module in fingerprints and manifest.is_fresh(module, fingerprints[module], artifact_kinds):
+            skipped.append(module)
+        else:
+            stale.append(module)
+    console.print(f"[yellow]Exporting {len(stale)} topics using {jobs} worker(s), {len(skipped)} up to date...[/]")
+
+    results = [_failed_result(node["module"], node["issue"]) for node in invalid]
+
+    def run_pool(modules: List[str], workers: int) -> List[str]:
+        """Exports `modules`, returns the ones whose worker process died (the pool is broken for all of them then)."""
+        crashed = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_export_module_worker, module, theme_name, make_pdf, compact, gzip, pdf_engine, live_snippets,
+                                   timeout): module for module in modules}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    crashed.append(futures[future])
+                    continue
+                except Exception as e:
+                    result = _failed_result(futures[future], f"{type(e).__name__}: {e}")
+                results.append(result)
+                if result["status"] == "ok" and result["module"] in fingerprints:
+                    manifest.record(result["module"], fingerprints[result["module"]], result["artifacts"])
+                mark = "[green]✔[/]" if result["status"] == "ok" else "[red]✘[/]"
+                console.print(f"{mark} {result['module']}")
+        return crashed
+
+    start = time.perf_counter()
+    if stale:
+        crashed = run_pool(stale, min(jobs, len(stale)))
+        for module in crashed:  # alone in its own process, only the topic that kills its worker fails
+            if run_pool([module], 1):
+                results.append(_failed_result(module, "worker process died (crash or killed, e.g. out of memory)"))
+                console.print(f"[red]✘[/] {module}")
+        if compact:
+            stylesheet_path = get_shared_stylesheet_path(theme_name)
+            rules = {name: rule for result in results for name, rule in result["css_rules"].items()}
+            if write_shared_stylesheet(stylesheet_path, get_terminal_theme(theme_name), rules) and gzip:
+                write_gzip_sibling(stylesheet_path)
+        manifest.save()
+    elapsed = time.perf_counter() - start
+
+    print_export_summary(results, elapsed, skipped)
+    return results
+
+
+def print_export_summary(results: List[Dict], elapsed: float, skipped: Optional[List[str]] = None) -> None:
+    """
+    Prints the timing of every exported module (slowest first), the skipped modules and the overall wall time.
+    Args:
+        results (List[Dict]): results returned by the export workers
+        elapsed (float): wall clock seconds of the whole export
+        skipped (List[str]): modules that were not exported because their notes are up to date
+    """
+    skipped = skipped or []
+    if skipped:
+        display_utils.console.print(f"[dim]Skipped (up to date): {', '.join(skipped)}[/]")
+    rows = [["Module", "Render (s)", "HTML (s)", "PDF (s)", "Total (s)", "Status"]]
+    for r in sorted(results, key=lambda r: r["render"] + r["html"] + r["pdf"], reverse=True):
+        total = r["render"] + r["html"] + r["pdf"]
+        status = r["status"] if not r["error"] else f"{r['status']}: {r['error']}"
+        rows.append([r["module"], f"{r['render']:.3f}", f"{r['html']:.3f}", f"{r['pdf']:.3f}", f"{total:.3f}", status])
+    display_utils.render_2d_table(rows, title="⏱️ Export Summary")
+    failed = sum(1 for r in results if r["status"] != "ok")
+    display_utils.console.print(f"[bold]{len(results) - failed} exported, {failed} failed, {len(skipped)} skipped in {elapsed:.2f}s[/]")
@@ -0,0 +1,135 @@
+# helpers/benchmark.py
+
+import hashlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+from . import display_utils
+from .catalog import PROJECT_ROOT
+from .display_utils import render_2d_table
+
+DEFAULT_BENCHMARK_CACHE_DIR = PROJECT_ROOT / ".cache" / "benchmarks"
+BENCHMARK_REPEAT = 5  # timed repeats per measurement, the table shows their min / median / IQR
+BENCHMARK_MIN_TIME = 0.02  # seconds one repeat should last, the loop count is raised until it does
+
+
+def machine_fingerprint()-> str:
+    """Identifies where timings were taken: host, CPU, number of cores and the exact Python version."""
+    parts = [platform.node(), platform.machine(), platform.processor(), str(os.cpu_count()), sys.version]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+
+def format_seconds(seconds: float)-> str:
+    """Short human readable duration: 1.23 ms, 45.6 µs, 789 ns."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def _source(obj: Any)-> str:
+    if isinstance(obj, str):
+        return obj
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, "__qualname__", repr(obj))
+
+
+def _timer(candidate: Union[Callable, str], size: Optional[int], data: Any)-> timeit.Timer:
+    if isinstance(candidate, str):
+        return timeit.Timer(candidate, globals={"n": size, "data": data})
+    if size is None:
+        return timeit.Timer(candidate)
+    return timeit.Timer(lambda: candidate(data))
+
+
+def _loop_counts():
+    """1, 2, 5, 10, 20, 50, ... like timeit.Timer.autorange()"""
+    scale = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            yield multiplier * scale
+        scale *= 10
+
+
+def measure(timer: timeit.Timer, repeat: int = BENCHMARK_REPEAT, min_time: float = BENCHMARK_MIN_TIME)-> Dict:
+    """
+    Calibrated timing: the loop count grows (1, 2, 5, 10, 20, ...) until one loop run lasts `min_time`,
+    then `repeat` runs of that many loops are timed.
+    Returns {"min", "median", "iqr"} in seconds per call, plus "loops" and "repeat".
+    Args:
+        timer (timeit.Timer): what to time
+        repeat (int): number of timed runs, at least 2 for the IQR
+        min_time (float): seconds one run should last
+    """
+    for number in _loop_counts():
+        if timer.timeit(number) >= min_time:
+            break
+    times = [total / number for total in timer.repeat(max(2, repeat), number)]
+    q1, _, q3 = statistics.quantiles(times, n=4)
+    return {"min": min(times), "median": statistics.median(times), "iqr": q3 - q1, "loops": number, "repeat": len(times)}
+
+
+def compare_timings(candidates: Dict[str, Union[Callable, str]], sizes: Optional[List[int]] = None,
+                    setup: Optional[Callable[[int], Any]] = None, title: str = "⏱️ Timing comparison",
+                    repeat: int = BENCHMARK_REPEAT, min_time: float = BENCHMARK_MIN_TIME,
+                    cache_dir: Optional[Path] = DEFAULT_BENCHMARK_CACHE_DIR)-> List[Dict]:
+    """
+    Times several ways of doing the same thing and shows min, median, IQR and the speedup over the first one
+    (per input size) as a table. Results are cached per machine, keyed by the source of the candidates, so
+    rendering the lesson again does not benchmark again. Only timings taken on screen are cached: a topic rendered
+    by a parallel worker (display_utils.OFFSCREEN_RENDER) shows the cached timings, or measures under the load of
+    the other workers without keeping the result.
+    Returns the measured rows: {"size", "name", "min", "median", "iqr", "loops", "repeat"}.
+    Args:
+        candidates (Dict): name -> callable or statement, the first one is the baseline. With `sizes`, callables
+            get the input as argument and statements see it as `data` (and the size as `n`)
+        sizes (List[int]): input sizes to sweep, None for one measurement without input
+        setup (Callable): builds the input of a size, e.g. lambda n: list(range(n)), the size itself when None
+        title (str): title of the table
+        repeat (int): timed runs per measurement
+        min_time (float): seconds one timed run should last
+        cache_dir (Path): where results are kept, None to always measure
+    """
+    key_parts = [machine_fingerprint(), json.dumps(sizes), _source(setup) if setup else "", str(repeat), str(min_time)]
+    key_parts += [f"{name}\0{_source(candidate)}" for name, candidate in candidates.items()]
+    cache_file = Path(cache_dir) / f"{hashlib.sha256(chr(1).join(key_parts).encode()).hexdigest()}.json" if cache_dir else None
+    rows = None
+    if cache_file is not None:
+        try:
+            rows = json.loads(cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            rows = None
+    measured_offscreen = rows is None and display_utils.OFFSCREEN_RENDER
+    if rows is None:
+        rows = []
+        for size in sizes or [None]:
+            data = size if setup is None or size is None else setup(size)
+            for name, candidate in candidates.items():
+                rows.append({"size": size, "name": name, **measure(_timer(candidate, size, data), repeat, min_time)})
+        if cache_file is not None and not measured_offscreen:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps(rows), encoding="utf-8")
+                tmp_file.replace(cache_file)
+            except OSError:
+                pass  # not caching only costs a new measurement next time
+
+    baseline = {}
+    for row in rows:
+        baseline.setdefault(row["size"], row["median"])
+    table = [(["Input size"] if sizes else []) + ["Candidate", "Min", "Median", "IQR", "Speedup"]]
+    for row in rows:
+        speedup = baseline[row["size"]] / row["median"] if row["median"] else float("inf")
+        table.append(([f"{row['size']:,}"] if sizes else []) + [row["name"], format_seconds(row["min"]), format_seconds(row["median"]),
+                                                                 format_seconds(row["iqr"]), f"{speedup:.2f}×"])
+    render_2d_table(table, title=f"{title} (measured alongside other renders)" if measured_offscreen else title)
+    return rows
@@ -0,0 +1,152 @@
+# helpers/book.py
+
+import contextlib
+import importlib
+import io
+import os
+import tempfile
+import time
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+from rich.console import Console
+from . import display_utils
+from .batch_export import EXPORT_WIDTH
+from .catalog import PROJECT_ROOT, Catalog
+from .custom_terminal_themes import get_terminal_theme
+from .export_manifest import compute_source_fingerprint
+from .html_stream import StreamingHtmlWriter
+from .replay_cache import ReplayCache
+
+DEFAULT_BOOK_PATH = PROJECT_ROOT / "Notes" / "python_course.html"
+
+BOOK_STYLE = """<title>{title}</title>
+<style>
+.book-title, .book-toc, .book-topic {{ font-family: system-ui, sans-serif; }}
+.book-toc ul {{ list-style: none; padding-left: 1.2rem; }}
+.book-toc a {{ color: inherit; }}
+.book-topic {{ break-before: page; margin: 0 0 .5rem; }}
+</style>"""
+
+
+def _render_topic_for_book(module: str, fingerprint: str, cache_dir: str, scratch_cache_dir: str)-> Dict:
+    """
+    Runs in a worker process: renders one topic at the export width and stores its segments in a replay cache,
+    the shared one when the topic allows replays, the book's scratch one otherwise (date, random, ... topics).
+    Returns {"module", "cache_dir", "render", "error"}.
+    """
+    result = {"module": module, "cache_dir": cache_dir, "render": 0.0, "error": ""}
+    display_utils.console = Console(record=True, file=io.StringIO(), width=EXPORT_WIDTH, force_terminal=True)
+    display_utils.OFFSCREEN_RENDER = True
+    scope = display_utils.recording_scope(module)
+    cwd = os.getcwd()
+    try:
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="topic_book_") as scratch_dir, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(scratch_dir)  # demo files created by the topics must not land in the project
+            try:
+                mod = importlib.import_module(module)
+                with scope:
+                    mod.main()
+            finally:
+                os.chdir(cwd)
+        result["render"] = time.perf_counter() - start
+        if not getattr(mod, "REPLAY_CACHE", True):
+            result["cache_dir"] = scratch_cache_dir
+        ReplayCache(result["cache_dir"]).store(module, fingerprint, EXPORT_WIDTH, scope)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        scope.close()
+    return result
+
+
+def _toc_markup(catalog: Catalog, node_ids: List[str], rendered: set)-> str:
+    items = []
+    for node_id in node_ids:
+        node = catalog.get(node_id)
+        if node["children"]:
+            inner = _toc_markup(catalog, node["children"], rendered)
+            if inner:
+                items.append(f"<li>{escape(node['title'])}{inner}</li>")
+        elif node_id in rendered:
+            items.append(f'<li><a href="#{escape(node_id)}">{escape(node["title"])}</a></li>')
+    return f"<ul>{''.join(items)}</ul>" if items else ""
+
+
+def build_book(topics_file: str = "topics.json", output: Path = DEFAULT_BOOK_PATH, theme_name: str = "fruity",
+               jobs: Optional[int] = None, make_pdf: bool = True, title: str = "Python Course")-> Optional[Path]:
+    """
+    Builds one HTML "book" with every topic of topics.json, in menu order, behind a linked table of contents,
+    and prints it to a single PDF with one browser page.
+    Topics already in the replay cache at the export width are not run again, the others render in parallel.
+    Returns the path of the PDF (or of the HTML with make_pdf=False), None when nothing could be rendered or printed.
+    Args:
+        topics_file (str): path of the topics.json catalog
+        output (Path): HTML file to write, the PDF gets the same name with a .pdf suffix
+        theme_name (str): terminal theme of the book
+        jobs (int): number of worker processes, defaults to the number of CPUs
+        make_pdf (bool): print the book to PDF as well
+        title (str): title shown on the first page
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    console = display_utils.console
+    catalog = Catalog(topics_file)
+    nodes = [node for node in catalog.iter_modules() if not node["issue"]]
+    replay_cache = ReplayCache()
+    fingerprints = {node["module"]: compute_source_fingerprint(PROJECT_ROOT / node["file"]) for node in nodes}
+    to_render = [node["module"] for node in nodes if not replay_cache.has(node["module"], fingerprints[node["module"]], EXPORT_WIDTH)]
+    console.print(f"[yellow]Building the book: {len(nodes)} topics, {len(to_render)} to render...[/]")
+
+    start = time.perf_counter()
+    sources: Dict[str, ReplayCache] = {node["module"]: replay_cache for node in nodes}
+    failed: Dict[str, str] = {node["module"]: node["issue"] for node in catalog.iter_modules() if node["issue"]}
+    with tempfile.TemporaryDirectory(prefix="book_replays_") as scratch_cache_dir:
+        if to_render:
+            jobs = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=min(jobs, len(to_render))) as pool:
+                futures = [pool.submit(_render_topic_for_book, module, fingerprints[module], str(replay_cache.cache_dir), scratch_cache_dir)
+                           for module in to_render]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result["error"]:
+                        failed[result["module"]] = result["error"]
+                    else:
+                        sources[result["module"]] = ReplayCache(result["cache_dir"])
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        rendered = {node["id"] for node in nodes if node["module"] not in failed}
+        if not rendered:
+            console.print("[bold red]Error!!!: no topic could be rendered.[/bold red]")
+            return None
+        extra_head = BOOK_STYLE.format(title=escape(title))
+        with StreamingHtmlWriter(str(output), get_terminal_theme(theme_name), extra_head=extra_head) as writer:
+            writer.write_markup(f'<h1 class="book-title">{escape(title)}</h1>'
+                                f'<nav class="book-toc">{_toc_markup(catalog, catalog.roots, rendered)}</nav>')
+            for node in nodes:
+                if node["id"] not in rendered:
+                    continue
+                chunks = sources[node["module"]].iter_chunks(node["module"], fingerprints[node["module"]], EXPORT_WIDTH)
+                if chunks is None:
+                    failed[node["module"]] = "rendered output went missing from the replay cache"
+                    continue
+                writer.write_markup(f'<h2 class="book-topic" id="{escape(node["id"])}">{escape(node["path"])}</h2>')
+                for chunk in chunks:  # one chunk in memory at a time
+                    writer.write(chunk)
+
+    for module, error in failed.items():
+        console.print(f"[red]✘ {module}: {error}[/]")
+    console.print(f"[bold bright_green]Book HTML written to '{output}' in {time.perf_counter() - start:.2f}s[/]")
+    if not make_pdf:
+        return output
+
+    import asyncio
+    pdf_path = output.with_suffix(".pdf")
+    start = time.perf_counter()
+    # one page of the browser pool, one print; False when it failed (and said why), a PDF on disk is then an old one
+    if not asyncio.run(display_utils.create_pdf_from_html(str(output), str(pdf_path))):
+        return None
+    console.print(f"[dim]PDF printed in {time.perf_counter() - start:.2f}s[/]")
+    return pdf_path
@@ -0,0 +1,203 @@
+# helpers/browser_pool.py
+
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, List, Optional
+from playwright.async_api import async_playwright
+
+
+class BrowserPool:
+    """
+    Keeps a single headless Chromium alive on a background event loop and lends pages out of a bounded pool.
+    The browser is launched on first use, relaunched if it crashes, and shut down after sitting idle.
+    Args:
+        max_pages (int): maximum number of pages that can be borrowed at the same time
+        idle_timeout (float): seconds without any job after which the browser is closed
+    """
+
+    def __init__(self, max_pages: int = 4, idle_timeout: float = 60.0):
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self.launch_count = 0  # how many times Chromium was started, tests check that the pool is reused
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._free_pages: List = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._active_jobs = 0
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+
+    # ---------------------------------------------------------------------------------------------
+    # Public API (thread safe, can be called from any thread or event loop)
+    # ---------------------------------------------------------------------------------------------
+    def submit(self, job: Callable[..., Coroutine], *args: Any) -> Future:
+        """
+        Runs `await job(page, *args)` with a borrowed page and returns a concurrent Future of its result.
+        Use `future.result()` from sync code or `await asyncio.wrap_future(future)` from async code.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run_job(job, *args), loop)
+
+    def close(self, timeout: float = 10.0)-> None:
+        """Closes the browser (if running) and stops the background event loop."""
+        with self._thread_lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown_browser(), loop).result(timeout)
+        except Exception:
+            pass  # browser may already be dead, nothing more to clean
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+    @property
+    def is_running(self)-> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    # ---------------------------------------------------------------------------------------------
+    # Internals (run on the pool's own event loop)
+    # ---------------------------------------------------------------------------------------------
+    def _ensure_loop(self)-> asyncio.AbstractEventLoop:
+        with self._thread_lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._semaphore = None
+                self._launch_lock = None
+                self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def _run_job(self, job: Callable[..., Coroutine], *args: Any) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+        async with self._semaphore:
+            self._cancel_idle_timer()
+            self._active_jobs += 1
+            try:
+                for attempt in range(2):  # second attempt only happens after a browser crash
+                    page = await self._acquire_page()
+                    try:
+                        result = await job(page, *args)
+                    except Exception:
+                        await self._discard_page(page)
+                        if attempt == 0 and not self.is_running:
+                            continue  # browser died under us, relaunch and retry once
+                        raise
+                    self._release_page(page)
+                    return result
+            finally:
+                self._active_jobs -= 1
+                if self._active_jobs == 0:
+                    self._schedule_idle_shutdown()
+
+    async def _ensure_browser(self):
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self.is_running:
+                return self._browser
+            await self._shutdown_browser()  # clean whatever is left of a crashed browser
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch()
+            self._browser.on("disconnected", self._on_disconnected)
+            self.launch_count += 1
+            return self._browser
+
+    def _on_disconnected(self, browser)-> None:
+        if browser is self._browser:
+            self._browser = None
+            self._free_pages.clear()
+
+    async def _acquire_page(self):
+        browser = await self._ensure_browser()
+        while self._free_pages:
+            page = self._free_pages.pop()
+            if not page.is_closed():
+                return page
+        return await browser.new_page()
+
+    def _release_page(self, page)-> None:
+        if not page.is_closed() and self.is_running:
+            self._free_pages.append(page)
+
+    async def _discard_page(self, page)-> None:
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    def _schedule_idle_shutdown(self)-> None:
+        self._cancel_idle_timer()
+        loop = asyncio.get_running_loop()
+        self._idle_handle = loop.call_later(self.idle_timeout, lambda: loop.create_task(self._idle_shutdown()))
+
+    def _cancel_idle_timer(self)-> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    async def _idle_shutdown(self)-> None:
+        if self._active_jobs == 0:
+            await self._shutdown_browser()
+
+    async def _shutdown_browser(self)-> None:
+        self._cancel_idle_timer()
+        browser, playwright = self._browser, self._playwright
+        self._browser, self._playwright = None, None
+        self._free_pages.clear()
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+
+_default_pool: Optional[BrowserPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_browser_pool()-> BrowserPool:
+    """Returns the process wide BrowserPool, creating it on first call."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+async def print_page_to_pdf(page, url: str, pdf_filepath: str)-> None:
+    """
+    Pool job: opens `url` in the borrowed page and prints it to an A4 PDF.
+    Args:
+        page: playwright page lent by the BrowserPool
+        url (str): address of the page to print, usually a file:/// URI
+        pdf_filepath (str): file path where pdf file will store
+    """
+    await page.goto(url)
+    await page.pdf(path=pdf_filepath, format="A4", print_background=True)
+
+
+async def print_html_to_pdf(page, html: str, pdf_filepath: Optional[str] = None)-> bytes:
+    """
+    Pool job: loads the HTML markup straight into the borrowed page (no file, no file:/// URI) and prints it.
+    Returns the PDF bytes, also saved to `pdf_filepath` when given.
+    Args:
+        page: playwright page lent by the BrowserPool
+        html (str): complete, standalone HTML page (relative links cannot be resolved)
+        pdf_filepath (str): optional file path where the pdf file will store
+    """
+    await page.set_content(html, wait_until="load")
+    return await page.pdf(path=pdf_filepath, format="A4", print_background=True)
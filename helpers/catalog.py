@@ -0,0 +1,236 @@
+# helpers/catalog.py
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CATALOG_CACHE = PROJECT_ROOT / ".cache" / "catalog.json"
+CATALOG_FORMAT = 2  # bump when the compiled layout changes
+
+
+def slugify(text: str)-> str:
+    """Lower-case, dash separated version of a title, used to build readable stable ids."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "topic"
+
+
+def _exact_case_exists(path: Path)-> bool:
+    """Like Path.exists() but case sensitive on every OS, so Windows does not hide a wrong module name."""
+    try:
+        return path.name in os.listdir(path.parent)
+    except OSError:
+        return False
+
+
+def _listdir(path: Path)-> List[str]:
+    try:
+        return os.listdir(path)
+    except OSError:
+        return []
+
+
+def resolve_module_file(module: str, root: Path = PROJECT_ROOT)-> Dict[str, Optional[str]]:
+    """
+    Maps a dotted module name to its source file without importing it.
+    Returns {"file": relative path or None, "issue": problem description or None}.
+    Args:
+        module (str): dotted module path as written in topics.json
+        root (Path): project root the module path is relative to
+    """
+    relative = Path(*module.split("."))
+    for candidate in (relative.with_suffix(".py"), relative / "__init__.py"):
+        path = root / candidate
+        if _exact_case_exists(path):
+            return {"file": candidate.as_posix(), "issue": None}
+    # Look for the same path with another letter case, e.g. module_basics -> module_Basics.py
+    current = root
+    for part in relative.parts[:-1]:
+        match = next((name for name in _listdir(current) if name.lower() == part.lower()), None)
+        if match is None:
+            return {"file": None, "issue": f"'{module}' does not resolve: folder '{part}' not found"}
+        current = current / match
+    file_name = relative.parts[-1].lower() + ".py"
+    match = next((name for name in _listdir(current) if name.lower() == file_name), None)
+    if match is not None:
+        suggestion = ".".join(current.relative_to(root).parts + (match[:-3],))
+        return {"file": None, "issue": f"'{module}' does not match the file case, did you mean '{suggestion}'?"}
+    return {"file": None, "issue": f"'{module}' does not resolve: '{relative.with_suffix('.py').as_posix()}' not found"}
+
+
+def module_lookup_dirs(module: str, root: Path = PROJECT_ROOT)-> List[Path]:
+    """
+    Folders whose listing decides how a dotted module name resolves: the project root and every folder
+    along the module path (matched without regard to case, like resolve_module_file does).
+    Renaming, adding or deleting a file in one of them changes its mtime.
+    Args:
+        module (str): dotted module path as written in topics.json
+        root (Path): project root the module path is relative to
+    """
+    dirs, current = [root], root
+    for part in module.split("."):
+        names = _listdir(current)
+        match = part if part in names else next((name for name in names if name.lower() == part.lower()), None)
+        if match is None or not (current / match).is_dir():
+            break
+        current = current / match
+        dirs.append(current)
+    return dirs
+
+
+def _dir_stamps(dirs: List[str], root: Path)-> Dict[str, Optional[int]]:
+    stamps = {}
+    for relative in dirs:
+        try:
+            stamps[relative] = (root / relative).stat().st_mtime_ns
+        except OSError:
+            stamps[relative] = None
+    return stamps
+
+
+def compile_catalog(menu: List[dict], root: Path = PROJECT_ROOT)-> dict:
+    """
+    Flattens the nested topics.json menu into id -> node records plus lookup tables.
+    Every node gets a stable id built from its title path (e.g. 'data-structures/strings/basic-string-concepts'),
+    the ids of its children and, for leaves, the resolved module file or the validation issue.
+    "lookup_dirs" lists the folders the resolution depended on (see module_lookup_dirs), relative to `root`.
+    Args:
+        menu (List[dict]): content of topics.json
+        root (Path): project root the module paths are relative to
+    """
+    nodes: Dict[str, dict] = {}
+    by_module: Dict[str, str] = {}
+    by_path: Dict[str, str] = {}
+    issues: List[str] = []
+    lookup_dirs: Dict[str, None] = {}
+
+    def add(items: List[dict], parent: Optional[dict])-> List[str]:
+        ids = []
+        for item in items:
+            base_id = slugify(item.get("title", ""))
+            if parent is not None:
+                base_id = f"{parent['id']}/{base_id}"
+            node_id, n = base_id, 2
+            while node_id in nodes:  # two siblings with the same title
+                node_id, n = f"{base_id}-{n}", n + 1
+            node = {
+                "id": node_id,
+                "title": item.get("title", ""),
+                "description": item.get("description", ""),
+                "tags": list(item.get("tags", [])),
+                "path": (parent["path"] + " / " if parent else "") + item.get("title", ""),
+                "parent": parent["id"] if parent else None,
+                "children": [],
+                "module": item.get("module"),
+                "file": None,
+                "issue": None,
+            }
+            nodes[node_id] = node
+            by_path[node["path"]] = node_id
+            if "subtopics" in item:
+                node["children"] = add(item["subtopics"], node)
+            elif node["module"]:
+                resolved = resolve_module_file(node["module"], root)
+                for folder in module_lookup_dirs(node["module"], root):
+                    lookup_dirs.setdefault(folder.relative_to(root).as_posix(), None)
+                node["file"], node["issue"] = resolved["file"], resolved["issue"]
+                if node["issue"]:
+                    issues.append(f"{node['path']}: {node['issue']}")
+                if node["module"] in by_module:
+                    issues.append(f"{node['path']}: module '{node['module']}' is listed more than once")
+                else:
+                    by_module[node["module"]] = node_id
+            else:
+                node["issue"] = "entry has neither 'subtopics' nor 'module'"
+                issues.append(f"{node['path']}: {node['issue']}")
+            ids.append(node_id)
+        return ids
+
+    roots = add(menu, None)
+    return {"format": CATALOG_FORMAT, "roots": roots, "nodes": nodes, "by_module": by_module, "by_path": by_path, "issues": issues,
+            "lookup_dirs": list(lookup_dirs)}
+
+
+class Catalog:
+    """
+    Compiled, validated view of topics.json with O(1) lookup by id, module or title path.
+    The compiled form is cached in .cache/catalog.json and reused while topics.json keeps the same mtime and size
+    and none of the folders the module files were resolved in changed (a topic file renamed, added or deleted).
+    Args:
+        topics_file (str): path of topics.json
+        cache_file (Path): where the compiled catalog is stored, None to disable the cache
+    """
+
+    def __init__(self, topics_file: str = "topics.json", cache_file: Optional[Path] = DEFAULT_CATALOG_CACHE):
+        self.topics_file = Path(topics_file)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.from_cache = False
+        stat = self.topics_file.stat()
+        self.source_stamp = [stat.st_mtime_ns, stat.st_size]
+        data = self._load_cache()
+        if data is None:
+            with open(self.topics_file, "r", encoding="utf-8") as f:
+                data = compile_catalog(json.load(f), self.topics_file.resolve().parent)
+            data["source"] = str(self.topics_file.resolve())
+            data["source_stamp"] = self.source_stamp
+            data["dir_stamps"] = _dir_stamps(data["lookup_dirs"], self.topics_file.resolve().parent)
+            self._save_cache(data)
+        self.roots: List[str] = data["roots"]
+        self.nodes: Dict[str, dict] = data["nodes"]
+        self.issues: List[str] = data["issues"]
+        self._by_module: Dict[str, str] = data["by_module"]
+        self._by_path: Dict[str, str] = data["by_path"]
+
+    def _load_cache(self)-> Optional[dict]:
+        if self.cache_file is None or not self.cache_file.exists():
+            return None
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return None
+        if (data.get("format") != CATALOG_FORMAT or data.get("source") != str(self.topics_file.resolve())
+                or data.get("source_stamp") != self.source_stamp
+                or data.get("dir_stamps") != _dir_stamps(data.get("lookup_dirs", []), self.topics_file.resolve().parent)):
+            return None
+        self.from_cache = True
+        return data
+
+    def _save_cache(self, data: dict)-> None:
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(data), encoding="utf-8")
+            tmp_file.replace(self.cache_file)
+        except OSError:
+            pass  # a read-only checkout still works, it just compiles on every launch
+
+    def get(self, node_id: str)-> Optional[dict]:
+        return self.nodes.get(node_id)
+
+    def by_module(self, module: str)-> Optional[dict]:
+        node_id = self._by_module.get(module)
+        return self.nodes[node_id] if node_id else None
+
+    def by_path(self, path: str)-> Optional[dict]:
+        """Looks a node up by its title path, e.g. 'Data Structures / Strings / Basic String Concepts'."""
+        node_id = self._by_path.get(path)
+        return self.nodes[node_id] if node_id else None
+
+    def children(self, node_id: Optional[str] = None)-> List[dict]:
+        """Child nodes of `node_id`, or the top level entries when it is None."""
+        ids = self.roots if node_id is None else self.nodes[node_id]["children"]
+        return [self.nodes[i] for i in ids]
+
+    def iter_modules(self)-> Iterator[dict]:
+        """Yields every module leaf in menu order."""
+        def walk(ids: List[str])-> Iterator[dict]:
+            for node_id in ids:
+                node = self.nodes[node_id]
+                if node["children"]:
+                    yield from walk(node["children"])
+                elif node["module"]:
+                    yield node
+        yield from walk(self.roots)
@@ -0,0 +1,198 @@
+# helpers/content_index.py
+
+import ast
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from .catalog import PROJECT_ROOT
+from .search import tokenize
+
+DEFAULT_CONTENT_INDEX_FILE = PROJECT_ROOT / ".cache" / "content_index.json"
+CONTENT_INDEX_FORMAT = 1
+TOPICS_DIR = PROJECT_ROOT / "topics"
+
+# display helper -> kind of lesson text its positional/keyword string arguments hold
+LESSON_CALLS = {
+    "print_heading": ("heading", ["title", "description"]),
+    "print_sub_heading": ("sub_heading", ["title"]),
+    "print_small_sub_heading": ("small_heading", ["title"]),
+    "display_note": ("note", ["message"]),
+    "imp_note_points": ("points", ["points", "topic"]),
+    "show_code_with_output": ("code", ["code_str", "output_str"]),
+}
+
+
+def _literal_text(node: ast.AST)-> Optional[str]:
+    """Text of a string constant or f-string (placeholders dropped), None for anything else."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return "".join(part.value for part in node.values if isinstance(part, ast.Constant) and isinstance(part.value, str))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):  # "..." + "..." concatenations
+        left, right = _literal_text(node.left), _literal_text(node.right)
+        if left is not None or right is not None:
+            return (left or "") + (right or "")
+    return None
+
+
+class _LessonVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.items: List[dict] = []
+        self.sections: List[str] = ["(introduction)"]
+
+    def visit_Call(self, node: ast.Call)-> None:
+        name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if name in LESSON_CALLS:
+            kind, params = LESSON_CALLS[name]
+            arguments = {param: arg for param, arg in zip(params, node.args)}
+            arguments.update({kw.arg: kw.value for kw in node.keywords if kw.arg in params})
+            texts = {param: _literal_text(arg) for param, arg in arguments.items()}
+            if kind == "sub_heading" and texts.get("title"):
+                self.sections.append(texts["title"])
+            item = {"kind": kind, "section": len(self.sections) - 1, "line": node.lineno}
+            item.update({param: text for param, text in texts.items() if text is not None})
+            if len(item) > 3:
+                self.items.append(item)
+        self.generic_visit(node)
+
+
+def extract_lesson_content(path: Path)-> Dict[str, list]:
+    """
+    Pulls the lesson text out of a topic module with `ast`, without importing or running it.
+    Returns {"sections": [section headings], "items": [{"kind", "section", "line", <argument name>: text, ...}]},
+    where section 0 is everything before the first print_sub_heading.
+    Args:
+        path (Path): source file of the topic module
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    visitor = _LessonVisitor()
+    visitor.visit(tree)
+    return {"sections": visitor.sections, "items": visitor.items}
+
+
+def _item_text(item: dict)-> str:
+    return "\n".join(value for key, value in item.items() if isinstance(value, str) and key != "kind")
+
+
+class ContentIndex:
+    """
+    Persistent positional full-text index over the lesson text of every file under topics/.
+    A file is re-parsed only when its mtime changed. Queries return (module, section) hits;
+    a query in double quotes only matches the words as a consecutive phrase.
+    Args:
+        topics_dir (Path): folder that holds the topic modules
+        index_file (Path): where the index is stored, None to keep it in memory only
+    """
+
+    def __init__(self, topics_dir: Path = TOPICS_DIR, index_file: Optional[Path] = DEFAULT_CONTENT_INDEX_FILE):
+        self.topics_dir = Path(topics_dir)
+        self.index_file = Path(index_file) if index_file else None
+        self.files: Dict[str, dict] = {}
+        self.reindexed: List[str] = []
+        self._load()
+        self._update()
+        self._build_postings()
+
+    def _load(self)-> None:
+        if self.index_file is None or not self.index_file.exists():
+            return
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return
+        if data.get("format") == CONTENT_INDEX_FORMAT:
+            self.files = data["files"]
+
+    def _update(self)-> None:
+        seen = set()
+        root = self.topics_dir.parent
+        for path in sorted(self.topics_dir.rglob("*.py")):
+            if path.name == "__init__.py":
+                continue
+            key = path.relative_to(root).as_posix()
+            seen.add(key)
+            mtime = path.stat().st_mtime_ns
+            if key in self.files and self.files[key]["mtime_ns"] == mtime:
+                continue
+            try:
+                content = extract_lesson_content(path)
+            except SyntaxError:
+                content = {"sections": [], "items": []}
+            terms: Dict[str, List[List[int]]] = {}
+            position = 0
+            for item in content["items"]:
+                for token in tokenize(_item_text(item)):
+                    terms.setdefault(token, []).append([item["section"], position])
+                    position += 1
+                position += 1  # never let a phrase run across two helper calls
+            module = ".".join(Path(key).with_suffix("").parts)
+            self.files[key] = {"mtime_ns": mtime, "module": module, "sections": content["sections"],
+                               "items": content["items"], "terms": terms}
+            self.reindexed.append(key)
+        removed = [key for key in self.files if key not in seen]
+        for key in removed:
+            del self.files[key]
+        if self.reindexed or removed:
+            self._save()
+
+    def _save(self)-> None:
+        if self.index_file is None:
+            return
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps({"format": CONTENT_INDEX_FORMAT, "files": self.files}), encoding="utf-8")
+            tmp_file.replace(self.index_file)
+        except OSError:
+            pass
+
+    def _build_postings(self)-> None:
+        # term -> {file key: [[section, position], ...]}
+        self.postings: Dict[str, Dict[str, List[List[int]]]] = {}
+        for key, entry in self.files.items():
+            for term, positions in entry["terms"].items():
+                self.postings.setdefault(term, {})[key] = positions
+
+    def search(self, query: str, limit: int = 20)-> List[dict]:
+        """
+        Returns up to `limit` hits {"module", "file", "section", "heading", "count", "snippet"}, most matches first.
+        Every word must appear in the same section; "quoted words" must appear next to each other.
+        Args:
+            query (str): words to look for, wrap them in double quotes for a phrase search
+            limit (int): maximum number of hits
+        """
+        phrase = query.strip().startswith('"') and query.strip().endswith('"')
+        tokens = tokenize(query)
+        if not tokens or any(token not in self.postings for token in tokens):
+            return []
+        hits = []
+        for key in set.intersection(*(set(self.postings[token]) for token in tokens)):
+            per_token = [self.postings[token][key] for token in tokens]
+            if phrase:
+                following = [{tuple(p) for p in positions} for positions in per_token[1:]]
+                counts: Dict[int, int] = {}
+                for section, start in per_token[0]:
+                    if all((section, start + offset) in following[offset - 1] for offset in range(1, len(tokens))):
+                        counts[section] = counts.get(section, 0) + 1
+            else:
+                sections = set.intersection(*({section for section, _ in positions} for positions in per_token))
+                counts = {section: sum(1 for positions in per_token for s, _ in positions if s == section) for section in sections}
+            entry = self.files[key]
+            for section, count in counts.items():
+                hits.append({"module": entry["module"], "file": key, "section": section,
+                             "heading": entry["sections"][section], "count": count,
+                             "snippet": self._snippet(entry, section, tokens)})
+        hits.sort(key=lambda hit: hit["count"], reverse=True)
+        return hits[:limit]
+
+    def _snippet(self, entry: dict, section: int, tokens: List[str], width: int = 80)-> str:
+        for item in entry["items"]:
+            if item["section"] != section:
+                continue
+            text = " ".join(_item_text(item).split())
+            lowered = text.lower()
+            at = lowered.find(tokens[0])
+            if at != -1:
+                start = max(0, at - width // 3)
+                return ("…" if start else "") + text[start:start + width] + ("…" if start + width < len(text) else "")
+        return ""
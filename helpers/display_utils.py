@@ -1,20 +1,128 @@
 # helpers/display_utils.py
 
-from typing import Optional
-from rich.console import Console
+from typing import Dict, Optional, Union
+from rich.console import Console, RenderableType, RenderHook
+from rich.highlighter import ReprHighlighter
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
+from rich.text import Text
 from pathlib import Path
-from playwright.async_api import async_playwright
+import functools
+import inspect
+import os
+import sys
 from .custom_terminal_themes import get_terminal_theme
+from .document import Document, get_active_document
+from .html_stream import render_html, stream_html, write_gzip_sibling, write_shared_stylesheet
+from .recording import RecordingScope
+from .render_cache import CachedMarkdown, CachedSyntax
 from rich.table import Table
 from typing import List
 #from rich.columns import Columns
 #import rich.terminal_theme as themes
 #console = Console()
 console = Console(record=True)
+RECORD_MAX_SEGMENTS = 100_000  # segments a recording scope keeps in memory before spilling the oldest ones
+LIVE_SNIPPETS = False  # show_code_with_output runs the code and shows its real output (python main.py --live-snippets)
+OFFSCREEN_RENDER = False  # set in the worker processes that render topics in parallel (export-all, book, prefetch)
 
+NOTE_ICONS = {
+    "note": "📝",
+    "info": "ℹ️ ",
+    "warning": "⚠️ ",
+    "tip": "💡",
+    "error": "❌",
+    "example": "📘",
+}
+
+NOTE_COLORS = {
+    "note": "magenta",
+    "info": "cyan",
+    "warning": "yellow",
+    "tip": "green",
+    "error": "red",
+    "example": "blue",
+}
+
+
+def __getattr__(name: str):
+    # rich.markdown / rich.syntax are heavy (markdown-it, pygments) and only needed by some topics,
+    # so `from helpers.display_utils import Markdown` keeps working but loads them on first use
+    if name == "Markdown":
+        from rich.markdown import Markdown
+        return Markdown
+    if name == "Syntax":
+        from rich.syntax import Syntax
+        return Syntax
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_NODE_RENDERERS = {}  # node kind -> undecorated helper, used to render a captured document back to the terminal
+
+
+def _document_node(kind: str):
+    """
+    Makes a display helper emit a `kind` node (its arguments by name) into the active document, if any
+    (see helpers.document). Without an active document, or with echo on, the helper prints as usual.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        _NODE_RENDERERS[kind] = func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            document = get_active_document()
+            if document is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            document.append({"kind": kind, **bound.arguments})
+            if document.echo:
+                with document.paused():  # the helper's own print() calls are not extra text nodes
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class DocumentRenderHook(RenderHook):
+    """
+    Console render hook installed while a document is captured (see helpers.document.capture_document).
+    Renderables a topic prints straight to the console, outside the display helpers, become nodes as well:
+    a rich Syntax becomes a "syntax" node, anything else a "text" node with its plain text.
+    Without echo they are not printed at all, like the output of the display helpers.
+    Args:
+        document (Document): document being captured
+        console (Console): console the hook is installed on
+    """
+
+    def __init__(self, document: Document, console: Console):
+        self.document = document
+        self.console = console
+
+    def process_renderables(self, renderables: List[RenderableType])-> List[RenderableType]:
+        if self.document.is_paused or get_active_document() is not self.document:
+            return renderables  # a display helper printing its own node, or another thread
+        syntax_type = getattr(sys.modules.get("rich.syntax"), "Syntax", None)  # nothing is a Syntax before rich.syntax is loaded
+        for renderable in renderables:
+            if syntax_type is not None and isinstance(renderable, syntax_type):
+                lexer = renderable.lexer
+                self.document.append({"kind": "syntax", "code": renderable.code,
+                                      "lexer": lexer.aliases[0] if lexer is not None and lexer.aliases else "text"})
+            else:
+                segments = self.console.render(renderable, self.console.options)
+                self.document.add_text("".join(segment.text for segment in segments if not segment.control))
+        return renderables if self.document.echo else []
+
+
+def _print_syntax(code: str, lexer: str = "python")-> None:
+    """Terminal rendering of a "syntax" node."""
+    from rich.syntax import Syntax
+    console.print(Syntax(code, lexer, theme="fruity"))
+
+
+_NODE_RENDERERS["syntax"] = _print_syntax
+
+
+@_document_node("heading")
 def print_heading(title: str, description: str = "This Program is for showing working of ")-> None:
     """
     Prints a stylish heading along with its use
@@ -34,6 +142,7 @@ def print_heading(title: str, description: str = "This Program is for showing wo
     console.print(panel)
 
 
+@_document_node("sub_heading")
 def print_sub_heading(title: str)-> None:
     """
     Prints a numbered section sub-heading like: '8) Formatting Methods'
@@ -45,6 +154,7 @@ def print_sub_heading(title: str)-> None:
     console.print(panel)
 
 
+@_document_node("small_heading")
 def print_small_sub_heading(title: str, from_new_line: bool = False)-> None:
     """
     Prints a numbered section sub-heading inside Sub-heading'
@@ -58,6 +168,7 @@ def print_small_sub_heading(title: str, from_new_line: bool = False)-> None:
     print("-" * (len(title) + 6))  # Print a line of dashes equal to the length of the title plus 2 for padding
 
 
+@_document_node("note")
 def display_note(message: str, type: str="note", icon: Optional[str]=None, color: Optional[str]=None, message_continue: bool=False)-> None:
     """
     Display a styled note message.
@@ -67,26 +178,8 @@ def display_note(message: str, type: str="note", icon: Optional[str]=None, color
         type (str): Types of message
         icon (str): imoji to print along with type
     """
-    icons = {
-        "note": "📝",
-        "info": "ℹ️ ",
-        "warning": "⚠️ ",
-        "tip": "💡",
-        "error": "❌",
-        "example": "📘",
-    }
-
-    colors = {
-        "note": "magenta",
-        "info": "cyan",
-        "warning": "yellow",
-        "tip": "green",
-        "error": "red",
-        "example": "blue",
-    }
-
-    icon = icon if icon else icons.get(type.lower())
-    style = color if color else colors.get(type.lower())
+    icon = icon if icon else NOTE_ICONS.get(type.lower())
+    style = color if color else NOTE_COLORS.get(type.lower())
     if(message_continue):
         icon_style_str=f"{icon} {type.capitalize()}: "
         icon_style_len=len(icon_style_str)  # calculating combine length of icon, type and message
@@ -97,14 +190,9 @@ def display_note(message: str, type: str="note", icon: Optional[str]=None, color
         console.print(f"[{style}]{icon} {type.capitalize()}: {message}[/]")
 
 
-def imp_note_points(points: str, topic: str="Important Points")-> None:
-    """
-    Prints a stylish important points.
-    Args:
-       points (str): multiline string containing important notes
-    """
-    markdown = Markdown(points)
-    panel = Panel.fit(
+def _points_panel(points: str, topic: str="Important Points")-> Panel:
+    markdown = CachedMarkdown(points)  # parsed and laid out once per text and width
+    return Panel.fit(
     renderable=markdown,
     title=topic,
     title_align="left",
@@ -112,9 +200,19 @@ def imp_note_points(points: str, topic: str="Important Points")-> None:
     border_style="bold magenta",
     width=134,
     style="on black" )
-    console.print(panel)
 
 
+@_document_node("points")
+def imp_note_points(points: str, topic: str="Important Points")-> None:
+    """
+    Prints a stylish important points.
+    Args:
+       points (str): multiline string containing important notes
+    """
+    console.print(_points_panel(points, topic))
+
+
+@_document_node("table")
 def render_2d_table(data: List[List], title: str="📋 Data Table", inner_border: bool=False):
     if not data or not all(isinstance(row, list) for row in data):
         console.print("[bold red]Invalid or empty data provided.[/bold red]")
@@ -135,56 +233,145 @@ def render_2d_table(data: List[List], title: str="📋 Data Table", inner_border
     console.print(table)
 
 
+def _code_panel(code_str: str)-> Panel:
+    #themes: gruvbox-dark, ansi_dark, fruity, monokai, github-dark
+    return Panel(CachedSyntax(code_str, "python", line_numbers=True, theme="fruity"), title="🐍 Code", title_align="left", expand=False)
+
+
 def show_code_with_output(code_str: str, output_str: str)-> None:
     """
     Render code and its output side-by-side using Rich panels.
+    With LIVE_SNIPPETS on, the code is executed (see helpers.snippet_runner) and its real stdout/stderr
+    is shown instead of the hand-written output.
     Args:
         code_str (str): The Python code to display.
         output_str (str): The output/result of the code.
     """
-    #themes: gruvbox-dark, ansi_dark, fruity, monokai, github-dark
-    syntax_panel = Panel(Syntax(code_str, "python", line_numbers=True, theme="fruity"), title="🐍 Code", title_align="left", expand=False)
+    if LIVE_SNIPPETS:
+        from .snippet_runner import get_snippet_runner, snippet_output  # starts worker processes, only when asked for
+        output_str = Text(snippet_output(get_snippet_runner().run(code_str)))
+    _show_code_with_output(code_str, output_str)
+
+
+@_document_node("code")
+def _show_code_with_output(code_str: str, output_str: Union[str, Text])-> None:
+    syntax_panel = _code_panel(code_str)
+    if isinstance(output_str, Text):
+        output_str = ReprHighlighter()(output_str)  # real program output, never parsed as markup
     output_panel = Panel(output_str, title="🖨️ Output", title_align="left", highlight=True, expand=False)
     #console.print(Columns([syntax_panel, output_panel], column_first=True))
     console.print(syntax_panel)
     console.print(output_panel)
 
 
-def export_output_to_html(theme_name: str, filepath: str)-> None:
+def recording_scope(name: str, max_segments: int = RECORD_MAX_SEGMENTS, spill_to_disk: bool = True, spill_dir: Optional[str] = None)-> RecordingScope:
+    """
+    Creates a scope that records only the output printed inside a `with` block (see helpers.recording).
+    Args:
+        name (str): name of the scope, usually the topic module
+        max_segments (int): segments kept in memory before the oldest ones are spilled (or dropped)
+        spill_to_disk (bool): spill old segments to a temp file instead of dropping them
+        spill_dir (str): folder for the spill file, defaults to the system temp folder
+    """
+    return RecordingScope(name, console, max_segments=max_segments, spill_to_disk=spill_to_disk, spill_dir=spill_dir)
+
+
+def export_output_to_html(theme_name: str, filepath: str, scope: Optional[RecordingScope] = None,
+                          stylesheet_path: Optional[str] = None, update_stylesheet: bool = True, gzip: bool = False,
+                          raise_errors: bool = False)-> Optional[Dict[str, str]]:
     """
-    Saves all previously recorded console output to an HTML file.
+    Saves previously recorded console output to an HTML file, streamed segment by segment (see helpers.html_stream).
+    Returns the css rules a compact page uses ({} for a standalone page), None when the export failed.
     Args:
         theme_name (str): name of theme in which you want to export you output to html file
         filepath (str): file path where this file will save
+        scope (RecordingScope): export only the output of this scope instead of the whole console record
+        stylesheet_path (str): write a compact page that links this shared theme stylesheet instead of embedding styles
+        update_stylesheet (bool): add the rules of the page to the shared stylesheet right away
+        gzip (bool): also write a pre-compressed '<file>.gz' next to the page (and the stylesheet)
+        raise_errors (bool): raise the error instead of printing it, for callers that report failures themselves
     """
     try:
         theme_object = get_terminal_theme(theme_name)
-        console.save_html(filepath, theme=theme_object)
+        href = None
+        if stylesheet_path is not None:
+            href = Path(os.path.relpath(stylesheet_path, Path(filepath).parent)).as_posix()
+        if scope is None:
+            with console._record_buffer_lock:
+                rules = stream_html(console._record_buffer, filepath, theme=theme_object, stylesheet_href=href)
+                del console._record_buffer[:]  # same as save_html, the exported output is cleared
+        else:
+            # one spilled chunk in memory at a time
+            rules = stream_html(scope.iter_segments(), filepath, theme=theme_object, stylesheet_href=href)
+        if stylesheet_path is not None and update_stylesheet:
+            write_shared_stylesheet(stylesheet_path, theme_object, rules)
+            if gzip:
+                write_gzip_sibling(stylesheet_path)
+        if gzip:
+            write_gzip_sibling(filepath)
         console.print(f"[bold bright_green]Successfully exported output to '{filepath}'[/]")
+        return rules
     except Exception as e:
+        if raise_errors:
+            raise
         console.print(f"[bold red]Error!!!: {e}[/bold red]")
+        return None
 
 
-async def create_pdf_from_html(html_filepath: str, pdf_filepath: str)-> None:
+async def create_pdf_from_html(html_filepath: str, pdf_filepath: str, raise_errors: bool = False)-> bool:
     """
-    Converts a local HTML file to a PDF using a headless browser via Playwright.
+    Converts a local HTML file to a PDF using the shared headless browser pool (see helpers.browser_pool).
+    Returns True once the PDF is written, False when the conversion failed.
     Args:
         html_filepath (str): html file path, require for conversion
         pdf_filepath (str): file path where pdf file will store
+        raise_errors (bool): raise the error instead of printing it, for callers that report failures themselves
     """
+    import asyncio
+    from .browser_pool import get_browser_pool, print_page_to_pdf  # loads playwright only when a PDF is asked for
     try:
         console.print(f"[yellow]Converting HTML to PDF using browser automation...[/]")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-
-            absolute_html_path = Path(html_filepath).resolve() # Resolving relative file path to an absolute path.
-            html_uri = absolute_html_path.as_uri() # Convert that absolute path into a proper file:/// URI.
-           
-            await page.goto(html_uri)  # Go to the local HTML file using the full URI
-            await page.pdf(path=pdf_filepath, format="A4", print_background=True)  # Generate the PDF
-            await browser.close()   
+        absolute_html_path = Path(html_filepath).resolve() # Resolving relative file path to an absolute path.
+        html_uri = absolute_html_path.as_uri() # Convert that absolute path into a proper file:/// URI.
+        job = get_browser_pool().submit(print_page_to_pdf, html_uri, pdf_filepath)
+        await asyncio.wrap_future(job)  # browser stays alive in the pool for the next conversion
         console.print(f"[bold bright_green]Successfully exported PDF to '{pdf_filepath}'[/]")
+        return True
     except Exception as e:
+        if raise_errors:
+            raise
         console.print(f"[bold red]Error converting with Playwright: {e}[/bold red]")
+        return False
 
+
+async def create_pdf_bytes(theme_name: str = "fruity", scope: Optional[RecordingScope] = None, html: Optional[str] = None,
+                           pdf_filepath: Optional[str] = None, raise_errors: bool = False)-> Optional[bytes]:
+    """
+    Renders recorded output to a PDF fully in memory: the HTML is built as a string and handed to the browser page,
+    the PDF comes back as bytes (wrap them in io.BytesIO for a stream). Nothing touches the disk unless `pdf_filepath` is given.
+    Returns None when the conversion failed.
+    Args:
+        theme_name (str): name of theme used to build the HTML
+        scope (RecordingScope): output to convert, defaults to the whole console record (which is cleared, as in an HTML export)
+        html (str): ready made standalone HTML page to convert instead of recorded output
+        pdf_filepath (str): also save the PDF to this file
+        raise_errors (bool): raise the error instead of printing it, for callers that report failures themselves
+    """
+    import asyncio
+    from .browser_pool import get_browser_pool, print_html_to_pdf  # loads playwright only when a PDF is asked for
+    try:
+        if html is None:
+            theme_object = get_terminal_theme(theme_name)
+            if scope is None:
+                with console._record_buffer_lock:
+                    html = render_html(console._record_buffer, theme_object)
+                    del console._record_buffer[:]
+            else:
+                html = render_html(scope.iter_segments(), theme_object)
+        job = get_browser_pool().submit(print_html_to_pdf, html, pdf_filepath)
+        return await asyncio.wrap_future(job)
+    except Exception as e:
+        if raise_errors:
+            raise
+        console.print(f"[bold red]Error converting with Playwright: {e}[/bold red]")
+        return None
@@ -0,0 +1,135 @@
+# helpers/document.py
+
+import io
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+# Node kinds emitted by the display helpers, the other keys of a node are the helper's argument names:
+#   heading       title, description                              (print_heading)
+#   sub_heading   title                                           (print_sub_heading)
+#   small_heading title, from_new_line                            (print_small_sub_heading)
+#   note          message, type, icon, color, message_continue    (display_note)
+#   points        points, topic                                   (imp_note_points)
+#   table         data, title, inner_border                       (render_2d_table)
+#   code          code_str, output_str                            (show_code_with_output)
+#   syntax        code, lexer                                     (rich Syntax printed straight to the console)
+#   text          text                                            (plain print() calls of the topic)
+
+# CSI / OSC escape sequences and the other C0 control characters, except tab and newline
+_CONTROL_CODES = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)|\x1b[@-_]|[\x00-\x08\x0b-\x1f\x7f]")
+
+
+def strip_control_codes(text: str)-> str:
+    """Removes ANSI colours, cursor moves and other terminal control codes from captured text."""
+    return _CONTROL_CODES.sub("", text)
+
+
+class Document:
+    """
+    Structured lesson content: the list of nodes emitted by the display helpers while the document is captured.
+    Args:
+        title (str): title of the document, usually the topic module
+        echo (bool): also print to the terminal while capturing
+    """
+
+    def __init__(self, title: str = "", echo: bool = False):
+        self.title = title
+        self.echo = echo
+        self.nodes: List[dict] = []
+        self._paused = 0
+
+    def append(self, node: dict)-> None:
+        self.nodes.append(node)
+
+    def add_text(self, text: str)-> None:
+        """Adds plain printed text, merged with the previous node when that one is text as well."""
+        if self.nodes and self.nodes[-1]["kind"] == "text":
+            self.nodes[-1]["text"] += text
+        else:
+            self.nodes.append({"kind": "text", "text": text})
+
+    @contextmanager
+    def paused(self)-> Iterator[None]:
+        """While paused, plain prints are not added as text nodes (used when a helper prints its own node)."""
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+    @property
+    def is_paused(self)-> bool:
+        return self._paused > 0
+
+
+class _TextSink:
+    """
+    sys.stdout replacement that turns the plain print() calls of a topic into text nodes.
+    It is not a terminal, so Rich and other libraries writing to it do not emit colours, and whatever
+    control codes still come through are stripped from the text nodes (the echo keeps them).
+    """
+
+    def __init__(self, document: Document, stream):
+        self.document = document
+        self.stream = stream
+
+    def write(self, text: str)-> int:
+        if not self.document.is_paused:
+            self.document.add_text(strip_control_codes(text))
+        if self.document.echo:
+            self.stream.write(text)
+        return len(text)
+
+    def flush(self)-> None:
+        self.stream.flush()
+
+    def isatty(self)-> bool:
+        return False
+
+    def fileno(self)-> int:
+        raise io.UnsupportedOperation("captured output has no file descriptor")
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+
+_state = threading.local()
+
+
+def get_active_document()-> Optional[Document]:
+    """The document being captured on this thread, None when the helpers only print to the terminal."""
+    return getattr(_state, "document", None)
+
+
+@contextmanager
+def capture_document(title: str = "", echo: bool = False)-> Iterator[Document]:
+    """
+    Collects everything the display helpers (and plain prints) produce inside the `with` block into a Document.
+    Args:
+        title (str): title of the document
+        echo (bool): keep printing to the terminal as usual, by default nothing is rendered
+    """
+    from .display_utils import DocumentRenderHook, console  # display_utils imports this module
+
+    document = Document(title, echo)
+    previous_document = get_active_document()
+    previous_stdout = sys.stdout
+    _state.document = document
+    sys.stdout = _TextSink(document, previous_stdout)
+    # Renderables the topic prints straight to the console become nodes, and an echoing console that follows
+    # sys.stdout keeps writing to the terminal, so its coloured output never reaches the text nodes
+    follows_stdout = echo and console._file is None
+    if follows_stdout:
+        console.file = previous_stdout
+    console.push_render_hook(DocumentRenderHook(document, console))
+    try:
+        yield document
+    finally:
+        console.pop_render_hook()
+        if follows_stdout:
+            console.file = None
+        sys.stdout = previous_stdout
+        _state.document = previous_document
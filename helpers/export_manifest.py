@@ -0,0 +1,124 @@
+# helpers/export_manifest.py
+
+import hashlib
+import importlib.util
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from .custom_terminal_themes import get_terminal_theme
+
+RENDERER_VERSION = "1"  # bump when the look of the exported notes changes without any source change
+HELPERS_DIR = Path(__file__).resolve().parent
+DEFAULT_MANIFEST_PATH = HELPERS_DIR.parent / ".cache" / "export_manifest.json"
+
+
+def _hash_file(path: Path, digest: "hashlib._Hash")-> None:
+    digest.update(path.name.encode())
+    digest.update(path.read_bytes())
+
+
+def _package_version(name: str)-> str:
+    from importlib.metadata import PackageNotFoundError, version  # slow import, only needed when hashing
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def find_module_file(module: str)-> Optional[Path]:
+    """
+    Returns the source file of a dotted module name without executing the module itself.
+    Args:
+        module (str): dotted module path as written in topics.json
+    """
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin)
+
+
+def compute_source_fingerprint(module_file: Path)-> str:
+    """
+    Hashes everything the rendered output of a topic depends on: the topic source, every helper module
+    and the renderer versions.
+    Args:
+        module_file (Path): source file of the topic module
+    """
+    digest = hashlib.sha256()
+    _hash_file(module_file, digest)
+    for helper_file in sorted(HELPERS_DIR.glob("*.py")):
+        _hash_file(helper_file, digest)
+    digest.update(f"renderer={RENDERER_VERSION};rich={_package_version('rich')}".encode())
+    return digest.hexdigest()
+
+
+def compute_fingerprint(module_file: Path, theme_name: str, width: int, variant: str = "")-> str:
+    """
+    Hashes everything an exported note depends on: the source fingerprint, the theme colours, the width the topic
+    was rendered at (the menu exports at the terminal width, export-all at EXPORT_WIDTH) and the PDF engine version.
+    Args:
+        module_file (Path): source file of the topic module
+        theme_name (str): theme used for the HTML export
+        width (int): console width the exported output was rendered at
+        variant (str): export options that change the files, e.g. "compact=True,gzip=False"
+    """
+    digest = hashlib.sha256(compute_source_fingerprint(module_file).encode())
+    theme = get_terminal_theme(theme_name)
+    colors = [theme.background_color, theme.foreground_color] + [theme.ansi_colors[i] for i in range(16)]
+    digest.update(f"{theme_name}:{colors}".encode())
+    digest.update(f"width={width}".encode())
+    digest.update(f"playwright={_package_version('playwright')}".encode())
+    digest.update(variant.encode())
+    return digest.hexdigest()
+
+
+class ExportManifest:
+    """
+    Remembers, for every exported topic, the fingerprint of its inputs and the artifacts that were written.
+    A topic only needs to be exported again when its fingerprint changed or an artifact went missing.
+    Args:
+        path (Path): json file where the manifest is stored
+    """
+
+    def __init__(self, path: Path = DEFAULT_MANIFEST_PATH):
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (ValueError, OSError):
+                self.entries = {}  # a broken manifest only costs one full rebuild
+
+    def is_fresh(self, module: str, fingerprint: str, artifact_kinds: List[str])-> bool:
+        """
+        True when `module` was exported from the same inputs and every requested artifact is still on disk.
+        Args:
+            module (str): dotted module name
+            fingerprint (str): current value of compute_fingerprint()
+            artifact_kinds (List[str]): artifacts needed, e.g. ["html", "pdf"]
+        """
+        entry = self.entries.get(module)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        artifacts = entry.get("artifacts", {})
+        return all(kind in artifacts and Path(artifacts[kind]).exists() for kind in artifact_kinds)
+
+    def record(self, module: str, fingerprint: str, artifacts: Dict[str, str])-> None:
+        """
+        Stores the fingerprint and artifact paths of a successful export.
+        Artifacts of an entry with the same fingerprint are kept, so an HTML-only run does not forget the PDF.
+        """
+        entry = self.entries.get(module)
+        if entry and entry.get("fingerprint") == fingerprint:
+            entry["artifacts"].update(artifacts)
+        else:
+            self.entries[module] = {"fingerprint": fingerprint, "artifacts": dict(artifacts)}
+
+    def save(self)-> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(self.path)
@@ -0,0 +1,134 @@
+# helpers/export_queue.py
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from .display_utils import render_2d_table
+from .export_manifest import ExportManifest
+
+# The menu thread and the worker both update the export manifest, one at a time
+manifest_lock = threading.Lock()
+
+
+class ExportJob:
+    """
+    One queued export: `work()` is called on the worker thread and returns the artifacts it wrote ({kind: path}).
+    Status goes pending -> running -> done | failed.
+    """
+
+    def __init__(self, job_id: int, module: str, description: str, work: Callable[[], Dict[str, str]],
+                 fingerprint: Optional[str] = None):
+        self.id = job_id
+        self.module = module
+        self.description = description
+        self.work = work
+        self.fingerprint = fingerprint
+        self.status = "pending"
+        self.error = ""
+        self.artifacts: Dict[str, str] = {}
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self)-> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+def pdf_export_work(html_filepath: Path, pdf_filepath: Path)-> Callable[[], Dict[str, str]]:
+    """
+    Job body printing an exported HTML file to PDF with the shared browser pool.
+    Unlike create_pdf_from_html it prints nothing, the queue reports the outcome.
+    """
+    def work()-> Dict[str, str]:
+        from .browser_pool import get_browser_pool, print_page_to_pdf  # loads playwright only when a PDF is asked for
+        get_browser_pool().submit(print_page_to_pdf, Path(html_filepath).resolve().as_uri(), str(pdf_filepath)).result()
+        return {"pdf": str(pdf_filepath)}
+    return work
+
+
+class ExportQueue:
+    """
+    Background queue for slow exports (PDF printing) started from the interactive menu.
+    A single daemon worker thread serves the jobs in order, so the menu stays usable while they run.
+    Finished jobs are reported once through pop_finished(), which the menu calls before drawing itself.
+    """
+
+    def __init__(self):
+        self.jobs: List[ExportJob] = []
+        self._queue: "queue.Queue[ExportJob]" = queue.Queue()
+        self._finished: "queue.Queue[ExportJob]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._next_id = 1
+
+    def submit(self, module: str, description: str, work: Callable[[], Dict[str, str]],
+               fingerprint: Optional[str] = None)-> ExportJob:
+        """
+        Queues `work` and returns right away.
+        Args:
+            module (str): dotted module name the export belongs to
+            description (str): short text for the status view, e.g. "PDF"
+            work (Callable): does the export on the worker thread, returns {artifact kind: path}, raises on failure
+            fingerprint (str): when given, the artifacts are recorded in the export manifest under this fingerprint
+        """
+        job = ExportJob(self._next_id, module, description, work, fingerprint)
+        self._next_id += 1
+        self.jobs.append(job)
+        self._queue.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="export-queue", daemon=True)
+            self._thread.start()
+        return job
+
+    def _worker(self)-> None:
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            job.started = time.time()
+            try:
+                job.artifacts = job.work() or {}
+                missing = [path for path in job.artifacts.values() if not Path(path).exists()]
+                if missing:
+                    raise RuntimeError(f"'{missing[0]}' was not created")
+                if job.fingerprint is not None:
+                    with manifest_lock:
+                        manifest = ExportManifest()
+                        manifest.record(job.module, job.fingerprint, job.artifacts)
+                        manifest.save()
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = (str(e).strip().splitlines() or [type(e).__name__])[0]  # playwright errors span many lines
+            job.finished = time.time()
+            self._finished.put(job)
+            self._queue.task_done()
+
+    @property
+    def active_count(self)-> int:
+        """Jobs still pending or running."""
+        return sum(1 for job in self.jobs if job.status in ("pending", "running"))
+
+    def pop_finished(self)-> List[ExportJob]:
+        """Jobs that finished since the last call (each one is returned only once)."""
+        finished = []
+        while True:
+            try:
+                finished.append(self._finished.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def wait(self)-> None:
+        """Blocks until every queued job has finished."""
+        self._queue.join()
+
+    def print_status(self)-> None:
+        """Shows every job of the session with its status and timing."""
+        rows = [["#", "Module", "Export", "Status", "Time (s)", "Result"]]
+        for job in self.jobs:
+            result = job.error if job.status == "failed" else ", ".join(job.artifacts.values())
+            rows.append([job.id, job.module, job.description, job.status, f"{job.elapsed:.1f}", result])
+        render_2d_table(rows, title="📦 Background exports")
@@ -0,0 +1,259 @@
+# helpers/html_stream.py
+
+import gzip
+import hashlib
+import io
+import os
+import re
+import shutil
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, Optional, TextIO, Union
+from rich.segment import Segment
+from rich.terminal_theme import DEFAULT_TERMINAL_THEME, TerminalTheme
+
+# Same page as rich's CONSOLE_HTML_FORMAT, cut around the code so the code can be written piece by piece.
+# The class rules are only known once every segment has been seen, so they go in a second <style> at the end.
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<style>
+body {{
+    color: {foreground};
+    background-color: {background};
+}}
+</style>{extra_head}
+</head>
+<body>
+"""
+CODE_OPEN = """    <pre style="font-family:Menlo,'DejaVu Sans Mono',consolas,'Courier New',monospace"><code style="font-family:inherit">"""
+CODE_CLOSE = "</code></pre>"
+
+HTML_TAIL = """
+<style>
+{stylesheet}
+</style>
+</body>
+</html>
+"""
+
+# Compact pages carry no styles of their own, everything lives in the shared stylesheet of the theme
+COMPACT_HEAD = '<!DOCTYPE html><html><head><meta charset="UTF-8"><link rel="stylesheet" href="{href}">{extra_head}</head><body>'
+COMPACT_CODE_OPEN = "<pre><code>"
+COMPACT_TAIL = "</body></html>\n"
+_RULE_RE = re.compile(r"^\.(c[\w-]+)\{(.*)\}$")
+_CLASS_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+# Rules that show on blank text; spaces in any other style (plain colours, bold, italic) need no span
+_VISIBLE_ON_BLANK = ("background-color", "underline", "line-through", "overline")
+
+
+def css_class(rule: str)-> str:
+    """
+    Short class name derived from the css rule itself, so every exported file (and every parallel worker)
+    names a style the same way without sharing state. 24 bits of hash: collisions are caught when the
+    shared stylesheet is written.
+    """
+    value = int.from_bytes(hashlib.sha1(rule.encode()).digest()[:3], "big")
+    return "c" + "".join(_CLASS_ALPHABET[(value >> shift) & 63] for shift in (18, 12, 6, 0))
+
+
+def _minify_rule(rule: str)-> str:
+    return rule.replace(": ", ":").replace("; ", ";")
+
+
+class StreamingHtmlWriter:
+    """
+    Writes console segments to an HTML file as they come, instead of building the whole page in memory
+    like Console.save_html. Memory use stays constant however long the output is (only the table of
+    distinct styles is kept). The page is written to a temporary file and moved in place on close().
+    With `stylesheet_href` the page is compact: short hashed class names and a link to a shared stylesheet
+    (see write_shared_stylesheet) instead of a <style> block, the rules used are collected in `rules`.
+    Args:
+        filepath (str): file path where the HTML file will be saved, or an open text stream to write to (never closed here)
+        theme (TerminalTheme): colours used for the page and the styles
+        stylesheet_href (str): relative URL of the shared stylesheet, None for a standalone page
+        extra_head (str): markup added at the end of <head>, e.g. a <title> or extra styles
+    """
+
+    def __init__(self, filepath: Union[str, TextIO], theme: Optional[TerminalTheme] = None, stylesheet_href: Optional[str] = None,
+                 extra_head: str = ""):
+        self.theme = theme or DEFAULT_TERMINAL_THEME
+        self.compact = stylesheet_href is not None
+        self.segment_count = 0
+        self.rules: Dict[str, str] = {}  # class name -> css rule, compact pages only
+        self._styles: Dict[str, int] = {}  # css rule -> class number, as in Console.export_html
+        self._closed = False
+        if isinstance(filepath, (str, os.PathLike)):
+            self.filepath: Optional[Path] = Path(filepath)
+            self._tmp_path = self.filepath.with_name(self.filepath.name + ".part")
+            self._file: TextIO = open(self._tmp_path, "w", encoding="utf-8")
+        else:
+            self.filepath = None
+            self._file = filepath
+        if self.compact:
+            self._file.write(COMPACT_HEAD.format(href=escape(stylesheet_href), extra_head=extra_head))
+        else:
+            self._file.write(HTML_HEAD.format(foreground=self.theme.foreground_color.hex,
+                                              background=self.theme.background_color.hex, extra_head=extra_head))
+        self._code_open = COMPACT_CODE_OPEN if self.compact else CODE_OPEN
+        self._in_code = False
+        self._open_code()
+
+    def _open_code(self)-> None:
+        if not self._in_code:
+            self._file.write(self._code_open)
+            self._in_code = True
+
+    def write_markup(self, markup: str)-> None:
+        """
+        Writes raw HTML between the recorded output (headings, anchors, a table of contents...).
+        The current <pre><code> block is closed first, the next write() opens a new one.
+        """
+        if self._in_code:
+            self._file.write(CODE_CLOSE)
+            self._in_code = False
+        self._file.write(markup)
+
+    def write(self, segments: Iterable[Segment])-> None:
+        """Appends segments to the page (control segments are skipped, consecutive same-style ones merged)."""
+        self._open_code()
+        styles, theme, write, compact = self._styles, self.theme, self._file.write, self.compact
+        class_names: Dict[str, str] = {}  # rule -> class name, saves re-hashing the same rule
+        for text, style, _ in Segment.simplify(Segment.filter_control(segments)):  # same order as Console.export_html
+            self.segment_count += 1
+            text = escape(text)
+            if style:
+                rule = style.get_html_style(theme)
+                if compact:
+                    if not rule or (text.isspace() and not any(key in rule for key in _VISIBLE_ON_BLANK)):
+                        write(text)
+                        continue
+                    name = class_names.get(rule)
+                    if name is None:
+                        name = class_names[rule] = css_class(rule)
+                        self.rules[name] = _minify_rule(rule)
+                else:
+                    name = f"r{styles.setdefault(rule, len(styles) + 1)}"
+                if style.link:
+                    text = f'<a class="{name}" href="{style.link}">{text}</a>'
+                elif compact:
+                    text = f'<span class={name}>{text}</span>'  # hashed names never need quotes
+                else:
+                    text = f'<span class="{name}">{text}</span>'
+            write(text)
+
+    def close(self)-> None:
+        """Writes the stylesheet and the end of the page, then replaces `filepath` with the finished file."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._in_code:
+            self._file.write(CODE_CLOSE)
+        if self.compact:
+            self._file.write(COMPACT_TAIL)
+        else:
+            stylesheet = "\n".join(f".r{number} {{{rule}}}" for rule, number in self._styles.items() if rule)
+            self._file.write(HTML_TAIL.format(stylesheet=stylesheet))
+        if self.filepath is not None:
+            self._file.close()
+            os.replace(self._tmp_path, self.filepath)
+
+    def abort(self)-> None:
+        """Drops the partly written file, leaving `filepath` untouched."""
+        self._closed = True
+        if self.filepath is None:
+            return
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self)-> "StreamingHtmlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb)-> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def stream_html(segments: Iterable[Segment], filepath: str, theme: Optional[TerminalTheme] = None,
+                stylesheet_href: Optional[str] = None)-> Dict[str, str]:
+    """
+    Streams segments (e.g. RecordingScope.iter_segments(), which reads spilled chunks back one at a time)
+    into an HTML file. Returns the css rules the page needs from the shared stylesheet (empty for standalone pages).
+    Args:
+        segments (Iterable[Segment]): recorded console output
+        filepath (str): file path where the HTML file will be saved
+        theme (TerminalTheme): colours used for the page
+        stylesheet_href (str): relative URL of the shared stylesheet, for a compact page
+    """
+    with StreamingHtmlWriter(filepath, theme, stylesheet_href) as writer:
+        writer.write(segments)
+    return writer.rules
+
+
+def read_shared_stylesheet(path: Path)-> Dict[str, str]:
+    """Class rules already in a shared stylesheet, {} when it does not exist yet."""
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    return {match.group(1): match.group(2) for match in map(_RULE_RE.match, lines) if match}
+
+
+def write_shared_stylesheet(path: Path, theme: TerminalTheme, rules: Dict[str, str])-> bool:
+    """
+    Adds `rules` to the minified stylesheet shared by every compact page of a theme.
+    Rules are only ever added (class names are content hashes), so pages exported earlier keep working.
+    Returns True when the file changed.
+    Args:
+        path (Path): stylesheet file, e.g. topics/Notes/css/fruity.css
+        theme (TerminalTheme): page colours
+        rules (Dict[str, str]): class name -> css rule, as collected by StreamingHtmlWriter
+    """
+    path = Path(path)
+    existing = read_shared_stylesheet(path)
+    clashes = [name for name, rule in rules.items() if existing.get(name, rule) != rule]
+    if clashes:
+        raise ValueError(f"css class name collision for {', '.join(clashes)}, export again without the compact option")
+    merged = {**existing, **rules}
+    if path.exists() and merged == existing:
+        return False
+    page = (f"body{{color:{theme.foreground_color.hex};background-color:{theme.background_color.hex}}}"
+            "pre{font-family:Menlo,'DejaVu Sans Mono',consolas,'Courier New',monospace}code{font-family:inherit}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".part")
+    # one rule per line keeps the file easy to merge into, the page rules come first on their own line
+    tmp_path.write_text(page + "\n" + "\n".join(f".{name}{{{rule}}}" for name, rule in sorted(merged.items())) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_gzip_sibling(path: Path)-> Path:
+    """Writes a pre-compressed `<name>.gz` copy next to the file (streamed, reproducible bytes) and returns its path."""
+    path = Path(path)
+    gz_path = path.with_name(path.name + ".gz")
+    tmp_path = gz_path.with_name(gz_path.name + ".part")
+    with open(path, "rb") as source, open(tmp_path, "wb") as raw, gzip.GzipFile(filename=path.name, mode="wb", fileobj=raw, compresslevel=9, mtime=0) as target:
+        shutil.copyfileobj(source, target)
+    os.replace(tmp_path, gz_path)
+    return gz_path
+
+
+def render_html(segments: Iterable[Segment], theme: Optional[TerminalTheme] = None, extra_head: str = "")-> str:
+    """
+    Returns the standalone HTML page of the segments as a string, nothing is written to disk.
+    Args:
+        segments (Iterable[Segment]): recorded console output
+        theme (TerminalTheme): colours used for the page
+        extra_head (str): markup added at the end of <head>
+    """
+    buffer = io.StringIO()
+    with StreamingHtmlWriter(buffer, theme, extra_head=extra_head) as writer:
+        writer.write(segments)
+    return buffer.getvalue()
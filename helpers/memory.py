@@ -0,0 +1,115 @@
+# helpers/memory.py
+
+import sys
+import tracemalloc
+from collections import deque
+import types
+from typing import Any, Callable, Dict, List, Optional
+from .display_utils import render_2d_table
+
+# Shared by everything that uses them, not part of the object being measured
+_NOT_OWNED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.CodeType)
+
+
+def format_bytes(size: float)-> str:
+    """Short human readable size: 512 B, 1.5 KiB, 38.2 MiB."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def deep_size(obj: Any, seen: Optional[set] = None)-> int:
+    """
+    Bytes used by `obj` and everything it holds: items of containers, keys and values of dicts, attributes in
+    __dict__ or __slots__. Objects reached twice are counted once, classes, modules and functions not at all.
+    Iterators and generators count as their own size only, their values do not exist yet.
+    Args:
+        obj (Any): object to measure
+        seen (set): ids already counted, pass the same set to measure several objects without double counting
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]  # explicit stack, deeply nested data does not hit the recursion limit
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _NOT_OWNED):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for cls in type(current).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            for name in [slots] if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__") and hasattr(current, name):
+                    stack.append(getattr(current, name))
+    return total
+
+
+def peak_allocation(func: Callable[[], Any])-> int:
+    """
+    Peak of the memory traced by `tracemalloc` while `func()` runs, counted from the memory in use when it starts.
+    Tracing is switched on for the call (and off again) unless it was already on.
+    Args:
+        func (Callable): called without arguments, its result is dropped
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    in_use, _ = tracemalloc.get_traced_memory()
+    try:
+        func()
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+    return peak - in_use
+
+
+def _relative(size: int, baseline: int)-> str:
+    if not baseline:
+        return "-"
+    ratio = size / baseline
+    return f"1/{1 / ratio:,.0f}" if 0 < ratio < 0.01 else f"{ratio:.2f}×"  # 1/18,000 says more than 0.00×
+
+
+def compare_sizes(objects: Dict[str, Any], title: str = "🧠 Memory used by each object")-> List[Dict]:
+    """
+    Shows the shallow size (sys.getsizeof) and the deep size of some objects side by side, relative to the first one.
+    Returns the rows: {"name", "type", "shallow", "deep"} in bytes.
+    Args:
+        objects (Dict): name -> object to measure
+        title (str): title of the table
+    """
+    rows = [{"name": name, "type": type(obj).__name__, "shallow": sys.getsizeof(obj), "deep": deep_size(obj)}
+            for name, obj in objects.items()]
+    baseline = rows[0]["deep"] if rows else 0
+    table = [["Object", "Type", "getsizeof()", "Deep size", "Relative"]]
+    table += [[row["name"], row["type"], format_bytes(row["shallow"]), format_bytes(row["deep"]), _relative(row["deep"], baseline)]
+              for row in rows]
+    render_2d_table(table, title=title)
+    return rows
+
+
+def compare_peak_memory(callables: Dict[str, Callable[[], Any]], title: str = "🧠 Peak memory while running")-> List[Dict]:
+    """
+    Runs each callable under tracemalloc and shows the peak memory it allocated, relative to the first one.
+    Returns the rows: {"name", "peak"} in bytes.
+    Args:
+        callables (Dict): name -> callable without arguments
+        title (str): title of the table
+    """
+    rows = [{"name": name, "peak": peak_allocation(func)} for name, func in callables.items()]
+    baseline = rows[0]["peak"] if rows else 0
+    table = [["Code", "Peak allocated", "Relative"]]
+    table += [[row["name"], format_bytes(row["peak"]), _relative(row["peak"], baseline)] for row in rows]
+    render_2d_table(table, title=title)
+    return rows
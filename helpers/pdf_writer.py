@@ -0,0 +1,361 @@
+# helpers/pdf_writer.py
+
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from rich.style import Style
+from rich.terminal_theme import TerminalTheme
+from .custom_terminal_themes import get_terminal_theme
+from .display_utils import NOTE_COLORS
+from .document import Document
+
+# A lightweight PDF backend for captured documents (see helpers.document): standard PDF fonts only
+# (Helvetica and Courier, nothing embedded), so a lesson becomes a PDF in milliseconds without a browser.
+# Emoji and other characters outside the fonts' Windows-1252 range are replaced or dropped.
+
+PAGE_WIDTH, PAGE_HEIGHT = 595.0, 842.0  # A4 in points
+MARGIN = 42.0
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+TABLE_MIN_COLUMN_WIDTH = 28.0  # points, padding included: two or three characters per line in a squeezed column
+
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold", "F3": "Courier", "F4": "Courier-Bold"}
+REGULAR, BOLD, MONO, MONO_BOLD = "F1", "F2", "F3", "F4"
+
+# Glyph widths (1/1000 em) of the printable ASCII range, from the Adobe font metrics of Helvetica / Helvetica-Bold
+_HELVETICA = [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+              556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778,
+              722, 278, 500, 667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+              278, 278, 469, 556, 333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+              556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584]
+_HELVETICA_BOLD = [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+                   556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611, 975, 722, 722, 722, 722, 667, 611, 778,
+                   722, 278, 556, 722, 611, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+                   278, 333, 584, 556, 333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+                   611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584]
+_WIDTHS = {REGULAR: _HELVETICA, BOLD: _HELVETICA_BOLD}
+
+# Characters the standard fonts do not have, mapped to something readable
+_REPLACEMENTS = str.maketrans({
+    "─": "-", "━": "-", "═": "=", "│": "|", "┃": "|", "║": "|", "┌": "+", "┐": "+", "└": "+", "┘": "+",
+    "├": "+", "┤": "+", "┬": "+", "┴": "+", "┼": "+", "╭": "+", "╮": "+", "╰": "+", "╯": "+",
+    "→": "->", "←": "<-", "⇒": "=>", "≤": "<=", "≥": ">=", "≠": "!=", "✓": "v", "✔": "v", "✗": "x", "✘": "x",
+    "\t": "    ",
+})
+_MARKDOWN_INLINE = re.compile(r"\*\*|__|(?<!\w)[*_](?=\S)|(?<=\S)[*_](?!\w)|`")
+
+
+def _pdf_text(text: str)-> str:
+    """Text as the cp1252 subset the standard fonts can show (emoji and other symbols are dropped)."""
+    return text.translate(_REPLACEMENTS).encode("cp1252", "ignore").decode("cp1252")
+
+
+def _escape(text: str)-> bytes:
+    raw = text.encode("cp1252", "ignore")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def text_width(text: str, font: str, size: float)-> float:
+    """Width of `text` in points."""
+    if font in (MONO, MONO_BOLD):
+        return 0.6 * size * len(text)
+    widths = _WIDTHS[font]
+    return sum(widths[ord(c) - 32] if 32 <= ord(c) < 127 else 556 for c in text) * size / 1000
+
+
+def wrap_text(text: str, font: str, size: float, width: float)-> List[str]:
+    """Splits text into lines no wider than `width` (words longer than a line are cut, a line holds at least one character)."""
+    width = max(width, text_width("W", font, size))  # widest character, so cutting a word always makes progress
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, font, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while text_width(word, font, size) > width:  # a single word wider than the line
+                cut = max(1, int(len(word) * width / text_width(word, font, size)))
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _rgb(color: Tuple[int, int, int])-> str:
+    return " ".join(f"{c / 255:.3f}" for c in color)
+
+
+class PdfCanvas:
+    """Collects page content streams and lays out text top to bottom, starting a new page when one is full."""
+
+    def __init__(self, theme: TerminalTheme):
+        self.theme = theme
+        self.background = tuple(theme.background_color)
+        self.foreground = tuple(theme.foreground_color)
+        self.pages: List[List[str]] = []
+        self.y = 0.0
+        self.new_page()
+
+    def new_page(self)-> None:
+        self.pages.append([f"{_rgb(self.background)} rg 0 0 {PAGE_WIDTH} {PAGE_HEIGHT} re f"])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure_space(self, height: float)-> None:
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def color(self, name: Optional[str])-> Tuple[int, int, int]:
+        """RGB of a Rich colour name ("cyan", "bold bright_red" ...) in the theme, the foreground if unknown."""
+        if not name:
+            return self.foreground
+        try:
+            color = Style.parse(name).color
+        except Exception:
+            return self.foreground
+        if color is None:
+            return self.foreground
+        return tuple(color.get_truecolor(self.theme))
+
+    def rect(self, x: float, y: float, width: float, height: float, fill: Tuple[int, int, int], stroke: bool = False)-> None:
+        operator = "S" if stroke else "f"
+        paint = "RG" if stroke else "rg"
+        self.pages[-1].append(f"{_rgb(fill)} {paint} 0.6 w {x:.2f} {y:.2f} {width:.2f} {height:.2f} re {operator}")
+
+    def text(self, x: float, y: float, runs: List[Tuple[str, str, Tuple[int, int, int]]], size: float)-> None:
+        """Draws (text, font, colour) runs one after the other on a baseline."""
+        parts = [f"BT 1 0 0 1 {x:.2f} {y:.2f} Tm"]
+        for text, font, color in runs:
+            if text:
+                parts.append(f"/{font} {size} Tf {_rgb(color)} rg ({_escape(text).decode('latin-1')}) Tj")
+        parts.append("ET")
+        self.pages[-1].append(" ".join(parts))
+
+    def paragraph(self, text: str, font: str = REGULAR, size: float = 10, color: Optional[Tuple[int, int, int]] = None,
+                  indent: float = 0.0, leading: float = 1.35, label: Optional[Tuple[str, Tuple[int, int, int]]] = None)-> None:
+        """Wrapped text, optionally starting with a bold coloured label on the first line."""
+        color = color or self.foreground
+        label_width = text_width(label[0] + " ", BOLD, size) if label else 0.0
+        lines = wrap_text(_pdf_text(text), font, size, CONTENT_WIDTH - indent - label_width)
+        for i, line in enumerate(lines):
+            self.ensure_space(size * leading)
+            self.y -= size * leading
+            runs = [(line, font, color)]
+            if i == 0 and label:
+                runs.insert(0, (label[0] + " ", BOLD, label[1]))
+            self.text(MARGIN + indent, self.y, runs, size)
+
+    def gap(self, height: float)-> None:
+        self.y -= height
+
+
+def _code_runs(code: str, canvas: PdfCanvas, lexer: str = "python")-> List[List[Tuple[str, Tuple[int, int, int], bool]]]:
+    """Lines of (text, colour, bold) runs of code (Python by default), coloured like Rich's ANSI syntax theme in the terminal theme."""
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    from rich.syntax import ANSI_DARK
+
+    styles: Dict[object, Tuple[Tuple[int, int, int], bool]] = {}
+    lines: List[List[Tuple[str, Tuple[int, int, int], bool]]] = [[]]
+    try:
+        tokens = get_lexer_by_name(lexer).get_tokens(code)
+    except ClassNotFound:
+        tokens = get_lexer_by_name("text").get_tokens(code)
+    for token_type, value in tokens:
+        if token_type not in styles:
+            lookup = token_type
+            while lookup not in ANSI_DARK and lookup.parent is not None:
+                lookup = lookup.parent
+            style = ANSI_DARK.get(lookup, Style())
+            color = tuple(style.color.get_truecolor(canvas.theme)) if style.color else canvas.foreground
+            if style.dim:
+                color = tuple((c + b) // 2 for c, b in zip(color, canvas.background))
+            styles[token_type] = (color, bool(style.bold))
+        color, bold = styles[token_type]
+        for i, piece in enumerate(value.split("\n")):
+            if i:
+                lines.append([])
+            if piece:
+                lines[-1].append((_pdf_text(piece), color, bold))
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _code_box(canvas: PdfCanvas, title: str, lines: List[List[Tuple[str, Tuple[int, int, int], bool]]],
+              line_numbers: bool, size: float = 8.0)-> None:
+    """Monospace block on a slightly lighter background, long lines wrapped, split across pages when needed."""
+    leading = size * 1.3
+    gutter = 4 if line_numbers else 0
+    columns = int((CONTENT_WIDTH - 12) / (0.6 * size)) - gutter
+    box_fill = tuple(min(255, c + 18) for c in canvas.background)
+    dim = tuple((f + b) // 2 for f, b in zip(canvas.foreground, canvas.background))
+    canvas.ensure_space(leading * 3)
+    canvas.y -= leading
+    canvas.text(MARGIN, canvas.y, [(title, BOLD, canvas.color("bright_cyan"))], 9)
+    canvas.y -= 4
+    for number, runs in enumerate(lines, 1):
+        # wrap the runs of one source line at `columns` characters
+        rows: List[List[Tuple[str, Tuple[int, int, int], bool]]] = [[]]
+        used = 0
+        for text, color, bold in runs:
+            while text:
+                room = columns - used
+                if room <= 0:
+                    rows.append([])
+                    used, room = 0, columns
+                rows[-1].append((text[:room], color, bold))
+                used += len(text[:room])
+                text = text[room:]
+        for i, row in enumerate(rows):
+            canvas.ensure_space(leading)
+            canvas.rect(MARGIN, canvas.y - leading, CONTENT_WIDTH, leading, box_fill)
+            canvas.y -= leading
+            prefix = [(f"{number:>3} " if i == 0 else "    ", MONO, dim)] if line_numbers else []
+            canvas.text(MARGIN + 6, canvas.y + size * 0.3, prefix + [(t, MONO_BOLD if b else MONO, c) for t, c, b in row], size)
+    canvas.gap(6)
+
+
+def _table(canvas: PdfCanvas, title: str, rows: List[List[str]], size: float = 8.5)-> None:
+    if not rows or not rows[0]:  # render_2d_table accepts a table without columns, it shows nothing but its title
+        canvas.paragraph(title, BOLD, 10, canvas.color("bright_magenta"))
+        canvas.paragraph("(empty table)", REGULAR, size, canvas.color("bright_black"))
+        canvas.gap(8)
+        return
+    rows = [[_pdf_text(cell) for cell in row] for row in rows]
+    count = len(rows[0])
+    natural = [max(text_width(row[i], BOLD if r == 0 else REGULAR, size) for r, row in enumerate(rows)) + 8 for i in range(count)]
+    scale = min(1.0, CONTENT_WIDTH / sum(natural))
+    minimum = min(TABLE_MIN_COLUMN_WIDTH, CONTENT_WIDTH / count)
+    widths = [max(minimum, w * scale) for w in natural]
+    excess = sum(widths) - CONTENT_WIDTH
+    flexible = sum(w - minimum for w in widths)
+    if excess > 0 and flexible > 0:  # the columns raised to the minimum are paid for by the wider ones
+        widths = [w - (w - minimum) * excess / flexible for w in widths]
+    border = canvas.color("bright_black")
+    canvas.paragraph(title, BOLD, 10, canvas.color("bright_magenta"))
+    canvas.gap(3)
+    leading = size * 1.3
+    for r, row in enumerate(rows):
+        font = BOLD if r == 0 else REGULAR
+        cells = [wrap_text(cell, font, size, width - 8) for cell, width in zip(row, widths)]
+        height = max(len(cell) for cell in cells) * leading + 4
+        canvas.ensure_space(height)
+        x = MARGIN
+        for cell, width in zip(cells, widths):
+            canvas.rect(x, canvas.y - height, width, height, border, stroke=True)
+            for i, line in enumerate(cell):
+                canvas.text(x + 4, canvas.y - 2 - (i + 1) * leading + size * 0.3, [(line, font, canvas.foreground)], size)
+            x += width
+        canvas.y -= height
+    canvas.gap(8)
+
+
+def _markdown_lines(points: str)-> List[Tuple[str, bool]]:
+    """(text, is_bullet) lines of the markdown used by imp_note_points, with inline markers removed."""
+    lines = []
+    for line in points.strip().splitlines():
+        stripped = line.strip()
+        bullet = stripped.startswith(("- ", "* ", "+ "))
+        text = _MARKDOWN_INLINE.sub("", stripped[2:] if bullet else stripped).strip()
+        if text:
+            lines.append((text, bullet))
+    return lines
+
+
+def render_pdf(document: Document, theme_name: str = "fruity")-> bytes:
+    """
+    Lays out a captured document (headings, notes, important points, tables, code with its output, printed text)
+    on A4 pages with the colours of a terminal theme and returns the PDF file as bytes.
+    Args:
+        document (Document): captured lesson content
+        theme_name (str): terminal theme whose colours are used (background, text and syntax colours)
+    """
+    canvas = PdfCanvas(get_terminal_theme(theme_name))
+    for node in document.nodes:
+        kind = node["kind"]
+        if kind == "heading":
+            canvas.paragraph(node["title"], BOLD, 18, canvas.color("bright_red"))
+            canvas.paragraph(node["description"] + node["title"], REGULAR, 10)
+            canvas.gap(8)
+        elif kind == "sub_heading":
+            canvas.ensure_space(60)  # keep a section heading with the start of its section
+            canvas.gap(8)
+            canvas.paragraph(node["title"], BOLD, 14, canvas.color("bright_cyan"))
+            canvas.gap(4)
+        elif kind == "small_heading":
+            canvas.ensure_space(40)
+            canvas.gap(4)
+            canvas.paragraph(f"# {node['title']}:", BOLD, 11, canvas.color("bright_yellow"))
+        elif kind == "note":
+            color = canvas.color(node["color"] or NOTE_COLORS.get(node["type"].lower()))
+            label = None if node["message_continue"] else (f"{node['type'].capitalize()}:", color)
+            canvas.paragraph(node["message"], REGULAR, 10, indent=12 if node["message_continue"] else 0, label=label)
+            canvas.gap(2)
+        elif kind == "points":
+            canvas.gap(4)
+            canvas.paragraph(node["topic"], BOLD, 11, canvas.color("magenta"))
+            for text, bullet in _markdown_lines(node["points"]):
+                canvas.paragraph(f"• {text}" if bullet else text, REGULAR if bullet else BOLD, 9.5, indent=10 if bullet else 0)
+            canvas.gap(6)
+        elif kind == "table":
+            data = node["data"]
+            if data and all(isinstance(row, list) for row in data):
+                width = len(data[0])
+                _table(canvas, node["title"], [[str(cell) for cell in row] + [""] * (width - len(row)) for row in data])
+        elif kind == "code":
+            _code_box(canvas, "Code", _code_runs(node["code_str"].strip("\n"), canvas), line_numbers=True)
+            output = [[(_pdf_text(line), canvas.foreground, False)] for line in str(node["output_str"]).strip("\n").split("\n")]
+            _code_box(canvas, "Output", output, line_numbers=False)
+        elif kind == "syntax":
+            _code_box(canvas, node["lexer"].upper(), _code_runs(node["code"].strip("\n"), canvas, node["lexer"]), line_numbers=False)
+        elif kind == "text" and node["text"].strip():
+            lines = [[(_pdf_text(line), canvas.foreground, False)] for line in node["text"].strip("\n").split("\n")]
+            _code_box(canvas, "Output", lines, line_numbers=False)
+    return _assemble(canvas.pages, document.title)
+
+
+def _assemble(pages: List[List[str]], title: str)-> bytes:
+    """Builds the PDF file: catalog, page tree, the standard fonts and one compressed content stream per page."""
+    objects: List[bytes] = []
+
+    def add(body: bytes)-> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # filled in once the page tree exists
+    pages_id = add(b"")
+    font_ids = {name: add(f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>".encode())
+                for name, base in FONTS.items()}
+    fonts = " ".join(f"/{name} {object_id} 0 R" for name, object_id in font_ids.items())
+    page_ids = []
+    for content in pages:
+        stream = zlib.compress("\n".join(content).encode("latin-1"))
+        content_id = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH:g} {PAGE_HEIGHT:g}] "
+                            f"/Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>".encode()))
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>".encode()
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+    info_id = add(b"<< /Title (" + _escape(_pdf_text(title)) + b") /Producer (helpers.pdf_writer) >>")
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for object_id, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, info_id, xref)
+    return bytes(out)
+
+
+def write_pdf(document: Document, pdf_filepath: str, theme_name: str = "fruity")-> Path:
+    """Writes render_pdf() of the document to a file and returns its path."""
+    path = Path(pdf_filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(render_pdf(document, theme_name))
+    return path
@@ -0,0 +1,170 @@
+# helpers/prefetch.py
+
+import ast
+import atexit
+import contextlib
+import importlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Optional
+from rich.console import Console
+from . import display_utils
+from .catalog import PROJECT_ROOT
+from .content_index import extract_lesson_content
+from .export_manifest import compute_source_fingerprint, find_module_file
+from .replay_cache import DEFAULT_REPLAY_DIR, ReplayCache
+
+
+def warm_render_caches(module_file: Path, width: int)-> None:
+    """
+    Renders the code blocks and note panels of a topic (found with ast, see helpers.content_index) into a throwaway
+    console, so the syntax and markdown caches already hold them when the topic is opened.
+    Args:
+        module_file (Path): source file of the topic module
+        width (int): width of the console the topic will be shown on
+    """
+    offscreen = Console(file=io.StringIO(), width=width, force_terminal=True)
+    for item in extract_lesson_content(module_file)["items"]:
+        if item["kind"] == "code" and "code_str" in item:
+            offscreen.print(display_utils._code_panel(item["code_str"]))
+        elif item["kind"] == "points" and "points" in item:
+            offscreen.print(display_utils._points_panel(item["points"], item.get("topic", "Important Points")))
+
+
+def allows_replay(module_file: Path)-> bool:
+    """
+    Value of the module level `REPLAY_CACHE = ...` flag of a topic (True when it is not set), read with ast.
+    Importing the topic instead would run its top level statements, prints included, in this process.
+    Args:
+        module_file (Path): source file of the topic module
+    """
+    tree = ast.parse(Path(module_file).read_text(encoding="utf-8"), filename=str(module_file))
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)
+                and any(isinstance(target, ast.Name) and target.id == "REPLAY_CACHE" for target in node.targets)):
+            return bool(node.value.value)
+    return True
+
+
+def prerender_topic(module: str, width: int, cache_dir: Path = DEFAULT_REPLAY_DIR)-> bool:
+    """
+    Runs a topic into an off-screen recording console and stores the result in the replay cache.
+    Meant to run in its own process (python -m helpers.prefetch <module> <width> [<cache dir>]), it imports the topic,
+    changes the working directory and the display_utils console. Returns True when a replay entry was written.
+    Args:
+        module (str): dotted module name
+        width (int): terminal width to render at
+        cache_dir (Path): folder of the replay cache
+    """
+    module_file = find_module_file(module)
+    if module_file is None:
+        return False
+    fingerprint = compute_source_fingerprint(module_file)
+    display_utils.console = Console(record=True, file=io.StringIO(), width=width, force_terminal=True)
+    display_utils.OFFSCREEN_RENDER = True
+    scope = display_utils.recording_scope(module)
+    try:
+        with tempfile.TemporaryDirectory(prefix="topic_prefetch_") as scratch_dir, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(scratch_dir)  # demo files created by the topic must not land in the project
+            try:
+                with scope:
+                    mod = importlib.import_module(module)
+                    mod.main()
+            finally:
+                os.chdir(PROJECT_ROOT)
+        if not getattr(mod, "REPLAY_CACHE", True):
+            return False
+        ReplayCache(cache_dir).store(module, fingerprint, width, scope)
+        return True
+    finally:
+        scope.close()
+
+
+class TopicPrefetcher:
+    """
+    Background worker that gets the topics of the submenu on screen ready before the user picks one:
+    warms the syntax/markdown caches of each topic (from its source, see warm_render_caches) and pre-renders it into
+    the replay cache. Topics are only imported and run in the child process, so nothing they print at import time
+    reaches the screen or the recording of this process, and the working directory is never touched.
+    Calling start() with another submenu, or cancel(), stops the current work and kills the child process.
+    Args:
+        cache_dir (Path): folder of the replay cache the topics are pre-rendered into
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_REPLAY_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.prefetched: List[str] = []  # modules fully prepared, in order
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._cancel_event = threading.Event()
+        self._process: Optional[subprocess.Popen] = None
+        self._key = None
+        atexit.register(self.cancel)
+
+    def start(self, nodes: List[dict], width: int)-> None:
+        """
+        Starts preparing the module entries among `nodes` (catalog nodes of the submenu being shown).
+        Does nothing when the same submenu at the same width is already being (or was) prepared.
+        """
+        leaves = [node for node in nodes if node.get("module") and node.get("file") and not node.get("issue")]
+        key = (tuple(node["module"] for node in leaves), width)
+        if key == self._key:
+            return
+        self.cancel()
+        if not leaves:
+            return
+        self._key = key
+        self._thread = threading.Thread(target=self._run, args=(leaves, width, self._cancel_event), name="topic-prefetch", daemon=True)
+        self._thread.start()
+
+    def cancel(self, timeout: float = 2.0)-> None:
+        """Stops the background work (killing a running pre-render) and waits briefly for the thread to finish."""
+        self._cancel_event.set()
+        with self._lock:
+            process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._key = None
+        self._cancel_event = threading.Event()
+
+    def _run(self, leaves: List[dict], width: int, cancelled: threading.Event)-> None:
+        replay_cache = ReplayCache(self.cache_dir)
+        for node in leaves:
+            if cancelled.is_set():
+                return
+            try:
+                module_file = PROJECT_ROOT / node["file"]
+                warm_render_caches(module_file, width)
+                fingerprint = compute_source_fingerprint(module_file)
+                if allows_replay(module_file) and not replay_cache.has(node["module"], fingerprint, width):
+                    self._prerender_in_child(node["module"], width, cancelled)
+            except Exception:
+                continue  # prefetching is best effort, the topic still renders normally when opened
+            if not cancelled.is_set():
+                self.prefetched.append(node["module"])
+
+    def _prerender_in_child(self, module: str, width: int, cancelled: threading.Event)-> None:
+        with self._lock:
+            if cancelled.is_set():
+                return
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "helpers.prefetch", module, str(width), str(self.cache_dir)],
+                cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        try:
+            self._process.wait()
+        finally:
+            with self._lock:
+                self._process = None
+
+
+if __name__ == "__main__":
+    sys.exit(0 if prerender_topic(sys.argv[1], int(sys.argv[2]), *sys.argv[3:4]) else 1)
@@ -0,0 +1,56 @@
+# helpers/profiler.py
+
+import contextlib
+import importlib
+import io
+import os
+import tempfile
+import time
+from typing import List
+from rich.console import Console
+from . import display_utils
+from .render_cache import cache_stats
+
+PROFILE_WIDTH = 140
+
+
+def print_cache_stats(title: str = "🗃️ Render Caches")-> None:
+    """Prints the size, hits, misses and hit rate of every render cache as a table."""
+    rows: List[List] = [["Cache", "Size", "Max Size", "Hits", "Misses", "Evictions", "Hit Rate"]]
+    for stats in cache_stats():
+        rows.append([stats["name"], stats["size"], stats["maxsize"], stats["hits"], stats["misses"],
+                     stats["evictions"], f"{stats['hit_rate']:.0%}"])
+    display_utils.render_2d_table(rows, title=title)
+
+
+def profile_topic(module: str, repeat: int = 3)-> List[float]:
+    """
+    Renders a topic `repeat` times off-screen and prints the time of every run and the render cache statistics.
+    The first run shows the cold cost, the next ones how much the caches save.
+    Args:
+        module (str): dotted module name of the topic, as written in topics.json
+        repeat (int): how many times the topic is rendered
+    """
+    screen_console = display_utils.console
+    timings = []
+    mod = importlib.import_module(module)
+    cwd = os.getcwd()
+    try:
+        for _ in range(repeat):
+            display_utils.console = Console(record=True, file=io.StringIO(), width=PROFILE_WIDTH, force_terminal=True)
+            with tempfile.TemporaryDirectory(prefix="topic_profile_") as scratch_dir, contextlib.redirect_stdout(io.StringIO()):
+                os.chdir(scratch_dir)
+                start = time.perf_counter()
+                try:
+                    mod.main()
+                finally:
+                    os.chdir(cwd)
+                timings.append(time.perf_counter() - start)
+    finally:
+        display_utils.console = screen_console
+
+    rows: List[List] = [["Run", "Time (ms)"]]
+    rows += [[i, f"{t * 1000:.1f}"] for i, t in enumerate(timings, 1)]
+    display_utils.render_2d_table(rows, title=f"⏱️ Rendering {module}")
+    print_cache_stats()
+    return timings
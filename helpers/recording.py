@@ -0,0 +1,119 @@
+# helpers/recording.py
+
+import os
+import pickle
+import sys
+import tempfile
+from typing import IO, Iterator, List, Optional
+from rich.console import Console
+from rich.file_proxy import FileProxy
+from rich.segment import Segment
+
+
+class _ScopeBuffer(list):
+    """
+    Record buffer installed on the console while a RecordingScope is open.
+    Rich only ever calls `extend` on it, which is where the memory cap is enforced.
+    """
+
+    def __init__(self, scope: "RecordingScope"):
+        super().__init__()
+        self.scope = scope
+
+    def extend(self, segments) -> None:
+        super().extend(segments)
+        if len(self) > self.scope.max_segments:
+            self.scope._evict()
+
+
+class RecordingScope:
+    """
+    Records only the console output produced between __enter__ and __exit__, instead of the whole session.
+    When more than `max_segments` segments are held in memory, the oldest half is spilled to a temp file
+    (or dropped when spilling is disabled), so a long topic never grows the memory without bound.
+    Args:
+        name (str): name of the scope, e.g. the topic module
+        console (Console): recording console whose output is captured
+        max_segments (int): maximum number of segments kept in memory
+        spill_to_disk (bool): write evicted segments to disk instead of dropping them
+        spill_dir (str): folder for the spill file, defaults to the system temp folder
+        capture_print (bool): also record plain print() calls made inside the scope
+    """
+
+    def __init__(self, name: str, console: Console, max_segments: int = 100_000, spill_to_disk: bool = True,
+                 spill_dir: Optional[str] = None, capture_print: bool = True):
+        self.name = name
+        self.console = console
+        self.max_segments = max(2, max_segments)
+        self.spill_to_disk = spill_to_disk
+        self.spill_dir = spill_dir
+        self.capture_print = capture_print
+        self.spilled_count = 0
+        self.dropped_count = 0
+        self._buffer = _ScopeBuffer(self)
+        self._spill_file: Optional[IO[bytes]] = None
+        self._previous_buffer: Optional[List[Segment]] = None
+        self._previous_stdout = None
+
+    def __enter__(self) -> "RecordingScope":
+        with self.console._record_buffer_lock:
+            self._previous_buffer = self.console._record_buffer
+            self.console._record_buffer = self._buffer
+        if self.capture_print:
+            self._previous_stdout = sys.stdout
+            sys.stdout = FileProxy(self.console, sys.stdout)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.capture_print:
+            sys.stdout.flush()  # pushes a last unfinished print(..., end="") line into the console
+            sys.stdout = self._previous_stdout
+        with self.console._record_buffer_lock:
+            self.console._record_buffer = self._previous_buffer
+        self._previous_buffer = None
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments still available for export (in memory + spilled)."""
+        return len(self._buffer) + self.spilled_count
+
+    def _evict(self) -> None:
+        keep = self.max_segments // 2
+        evicted = self._buffer[:-keep]
+        del self._buffer[:-keep]
+        if not self.spill_to_disk:
+            self.dropped_count += len(evicted)
+            return
+        if self._spill_file is None:
+            self._spill_file = tempfile.NamedTemporaryFile(prefix=f"{self.name}-", suffix=".spill", dir=self.spill_dir, delete=False)
+        pickle.dump(evicted, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spill_file.flush()
+        self.spilled_count += len(evicted)
+
+    def iter_chunks(self) -> Iterator[List[Segment]]:
+        """Yields the recorded segments in order, one spilled chunk at a time, then the in-memory ones."""
+        if self._spill_file is not None:
+            with open(self._spill_file.name, "rb") as f:
+                while True:
+                    try:
+                        yield pickle.load(f)
+                    except EOFError:
+                        break
+        yield list(self._buffer)
+
+    def iter_segments(self) -> Iterator[Segment]:
+        """Yields every recorded segment in order."""
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def close(self) -> None:
+        """Frees the in-memory segments and removes the spill file."""
+        self._buffer.clear()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            try:
+                os.remove(self._spill_file.name)
+            except OSError:
+                pass
+            self._spill_file = None
+        self.spilled_count = 0
@@ -0,0 +1,150 @@
+# helpers/render_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.measure import Measurement
+
+if TYPE_CHECKING:  # pygments and markdown-it are imported on the first cache miss, not at startup
+    from rich.markdown import Markdown
+    from rich.syntax import Syntax
+
+
+class LRUCache:
+    """
+    Small thread safe least-recently-used cache with hit/miss counters.
+    Args:
+        name (str): name shown in the cache statistics
+        maxsize (int): maximum number of entries kept, the least recently used one is evicted first
+    """
+
+    def __init__(self, name: str, maxsize: int = 256):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_caches: Dict[str, LRUCache] = {}
+
+
+def get_cache(name: str, maxsize: int = 256) -> LRUCache:
+    """Returns the named cache, creating it on first use so every cache shows up in cache_stats()."""
+    if name not in _caches:
+        _caches[name] = LRUCache(name, maxsize)
+    return _caches[name]
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Statistics of every render cache, in creation order."""
+    return [cache.stats() for cache in _caches.values()]
+
+
+syntax_cache = get_cache("syntax", maxsize=512)
+markdown_parse_cache = get_cache("markdown-parse", maxsize=256)
+markdown_cache = get_cache("markdown", maxsize=256)
+
+
+class CachedSyntax:
+    """
+    Drop-in replacement for rich.syntax.Syntax that keeps the highlighted lines in `syntax_cache`.
+    The key is (code, lexer, theme, line numbers, width), so re-running or exporting a topic skips Pygments entirely.
+    """
+
+    def __init__(self, code: str, lexer: str = "python", theme: str = "fruity", line_numbers: bool = True):
+        self.code = code
+        self.lexer = lexer
+        self.theme = theme
+        self.line_numbers = line_numbers
+        self._syntax: Optional[Syntax] = None
+
+    @property
+    def syntax(self) -> "Syntax":
+        if self._syntax is None:
+            from rich.syntax import Syntax
+            self._syntax = Syntax(self.code, self.lexer, theme=self.theme, line_numbers=self.line_numbers)
+        return self._syntax
+
+    def __rich_measure__(self, console: Console, options: ConsoleOptions) -> Measurement:
+        return self.syntax.__rich_measure__(console, options)  # only looks at line lengths, no lexing
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        key = (self.code, self.lexer, self.theme, self.line_numbers, options.max_width)
+        segments = syntax_cache.get(key)
+        if segments is None:
+            lines = console.render_lines(self.syntax, options, pad=False, new_lines=True)
+            segments = tuple(segment for line in lines for segment in line)
+            syntax_cache.put(key, segments)
+        yield from segments
+
+
+class CachedMarkdown:
+    """
+    Drop-in replacement for rich.markdown.Markdown that memoizes both steps of the work:
+    the markdown-it parse (keyed by the text) in `markdown_parse_cache` and the laid-out lines
+    (keyed by text and width) in `markdown_cache`.
+    """
+
+    def __init__(self, markup: str):
+        self.markup = markup
+
+    @property
+    def markdown(self) -> "Markdown":
+        markdown = markdown_parse_cache.get(self.markup)
+        if markdown is None:
+            from rich.markdown import Markdown
+            markdown = Markdown(self.markup)
+            markdown_parse_cache.put(self.markup, markdown)
+        return markdown
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        key = (self.markup, options.max_width)
+        segments = markdown_cache.get(key)
+        if segments is None:
+            lines = console.render_lines(self.markdown, options, pad=False, new_lines=True)
+            segments = tuple(segment for line in lines for segment in line)
+            markdown_cache.put(key, segments)
+        yield from segments
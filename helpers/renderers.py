@@ -0,0 +1,199 @@
+# helpers/renderers.py
+
+import html
+from typing import Callable, Dict, List, Union
+from . import display_utils
+from .document import Document
+from .pdf_writer import render_pdf
+
+
+def _note_label(node: dict)-> str:
+    icon = node["icon"] or display_utils.NOTE_ICONS.get(node["type"].lower(), "")
+    return f"{icon.strip()} {node['type'].capitalize()}:".strip()
+
+
+def _table_rows(node: dict)-> List[List[str]]:
+    data = node["data"]
+    if not data or not all(isinstance(row, list) for row in data):
+        return []
+    width = len(data[0])
+    return [[str(cell) for cell in row] + [""] * (width - len(row)) for row in data]
+
+
+# -------------------------------------------------------------------------------------------------
+# Terminal
+# -------------------------------------------------------------------------------------------------
+def render_terminal(document: Document)-> None:
+    """Prints a captured document with the regular Rich display helpers."""
+    for node in document.nodes:
+        if node["kind"] == "text":
+            print(node["text"], end="")
+        else:
+            arguments = {key: value for key, value in node.items() if key != "kind"}
+            display_utils._NODE_RENDERERS[node["kind"]](**arguments)
+
+
+# -------------------------------------------------------------------------------------------------
+# Plain text
+# -------------------------------------------------------------------------------------------------
+def _text_table(rows: List[List[str]])-> str:
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = [" | ".join(cell.ljust(w) for cell, w in zip(row, widths)) for row in rows]
+    lines.insert(1, "-+-".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def render_text(document: Document)-> str:
+    """Renders a document as plain text (no colours, no box drawing)."""
+    parts: List[str] = []
+    for node in document.nodes:
+        kind = node["kind"]
+        if kind == "heading":
+            parts.append(f"{node['title']}\n{'=' * len(node['title'])}\n{node['description']}{node['title']}\n\n")
+        elif kind == "sub_heading":
+            parts.append(f"\n{node['title']}\n{'-' * len(node['title'])}\n")
+        elif kind == "small_heading":
+            parts.append(f"{chr(10) if node['from_new_line'] else ''} # {node['title']}:\n{'-' * (len(node['title']) + 6)}\n")
+        elif kind == "note":
+            label = "" if node["message_continue"] else _note_label(node) + " "
+            parts.append(f"{label}{node['message']}\n")
+        elif kind == "points":
+            parts.append(f"{node['topic']}\n{node['points'].strip()}\n\n")
+        elif kind == "table":
+            rows = _table_rows(node)
+            if rows:
+                parts.append(f"{node['title']}\n{_text_table(rows)}\n\n")
+        elif kind == "code":
+            code = "\n".join("    " + line for line in node["code_str"].strip("\n").splitlines())
+            output = "\n".join("    " + line for line in str(node["output_str"]).splitlines())
+            parts.append(f"Code:\n{code}\nOutput:\n{output}\n\n")
+        elif kind == "syntax":
+            parts.append("\n".join("    " + line for line in node["code"].strip("\n").splitlines()) + "\n\n")
+        elif kind == "text":
+            parts.append(node["text"])
+    return "".join(parts)
+
+
+# -------------------------------------------------------------------------------------------------
+# Markdown
+# -------------------------------------------------------------------------------------------------
+def _markdown_cell(text: str)-> str:
+    return text.replace("|", "\\|").replace("\n", "<br>")
+
+
+def render_markdown(document: Document)-> str:
+    """Renders a document as GitHub flavoured Markdown."""
+    parts: List[str] = []
+    for node in document.nodes:
+        kind = node["kind"]
+        if kind == "heading":
+            parts.append(f"# {node['title']}\n\n{node['description']}{node['title']}\n\n")
+        elif kind == "sub_heading":
+            parts.append(f"## {node['title']}\n\n")
+        elif kind == "small_heading":
+            parts.append(f"### {node['title']}\n\n")
+        elif kind == "note" and node["message_continue"] and parts and parts[-1].startswith("> "):
+            parts[-1] = f"{parts[-1].rstrip()} {node['message']}\n\n"  # the continued message joins its note
+        elif kind == "note":
+            parts.append(f"> **{_note_label(node)}** {node['message']}\n\n")
+        elif kind == "points":
+            parts.append(f"**{node['topic']}**\n\n{node['points'].strip()}\n\n")
+        elif kind == "table":
+            rows = _table_rows(node)
+            if rows:
+                lines = ["| " + " | ".join(_markdown_cell(cell) for cell in row) + " |" for row in rows]
+                lines.insert(1, "|" + "---|" * len(rows[0]))
+                parts.append(f"**{node['title']}**\n\n" + "\n".join(lines) + "\n\n")
+        elif kind == "code":
+            parts.append(f"```python\n{node['code_str'].strip(chr(10))}\n```\n\nOutput:\n\n```text\n{str(node['output_str']).strip(chr(10))}\n```\n\n")
+        elif kind == "syntax":
+            parts.append(f"```{node['lexer']}\n{node['code'].strip(chr(10))}\n```\n\n")
+        elif kind == "text" and node["text"].strip():
+            parts.append(f"```text\n{node['text'].strip(chr(10))}\n```\n\n")
+    return "".join(parts)
+
+
+# -------------------------------------------------------------------------------------------------
+# Semantic HTML
+# -------------------------------------------------------------------------------------------------
+HTML_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<style>
+body {{ font-family: system-ui, sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; background: #1e1e1e; color: #f0f0f0; }}
+h1 {{ border-bottom: 2px solid #ff5555; }} h2 {{ border-bottom: 1px solid #00ffff; }}
+.note {{ margin: .4rem 0; }} .note-note {{ color: #ff66ff; }} .note-info {{ color: #00ffff; }} .note-warning {{ color: #ffdd00; }}
+.note-tip {{ color: #66d900; }} .note-error {{ color: #ff5555; }} .note-example {{ color: #6699ff; }}
+.points {{ border: 1px solid #ff66ff; padding: 0 1rem; }}
+pre {{ background: #111; padding: .6rem; overflow-x: auto; }} pre.output {{ background: #262626; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #555; padding: .2rem .5rem; }}
+{code_css}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def render_html(document: Document, code_style: str = "fruity")-> str:
+    """
+    Renders a document as a standalone semantic HTML page (headings, asides, tables, highlighted code),
+    in a single pass over the nodes and without Rich's segment pipeline.
+    Args:
+        document (Document): captured lesson content
+        code_style (str): Pygments style used for the code blocks
+    """
+    from markdown_it import MarkdownIt
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import PythonLexer, get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    formatter = HtmlFormatter(style=code_style, cssclass="highlight")
+    lexer = PythonLexer()
+    markdown = MarkdownIt("commonmark", {"html": False}).enable("table")
+    escape = html.escape
+    parts: List[str] = []
+    for node in document.nodes:
+        kind = node["kind"]
+        if kind == "heading":
+            parts.append(f"<header><h1>{escape(node['title'])}</h1><p>{escape(node['description'] + node['title'])}</p></header>")
+        elif kind == "sub_heading":
+            parts.append(f"<h2>{escape(node['title'])}</h2>")
+        elif kind == "small_heading":
+            parts.append(f"<h3>{escape(node['title'])}</h3>")
+        elif kind == "note":
+            label = "" if node["message_continue"] else f"<strong>{escape(_note_label(node))}</strong> "
+            parts.append(f'<p class="note note-{escape(node["type"].lower())}">{label}{escape(node["message"])}</p>')
+        elif kind == "points":
+            parts.append(f'<aside class="points"><h4>{escape(node["topic"])}</h4>{markdown.render(node["points"])}</aside>')
+        elif kind == "table":
+            rows = _table_rows(node)
+            if rows:
+                head = "".join(f"<th>{escape(cell)}</th>" for cell in rows[0])
+                body = "".join("<tr>" + "".join(f"<td>{escape(cell)}</td>" for cell in row) + "</tr>" for row in rows[1:])
+                parts.append(f"<table><caption>{escape(node['title'])}</caption><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>")
+        elif kind == "code":
+            parts.append(f"<figure>{highlight(node['code_str'].strip(chr(10)), lexer, formatter)}"
+                         f"<pre class=\"output\"><samp>{escape(str(node['output_str']))}</samp></pre></figure>")
+        elif kind == "syntax":
+            try:
+                node_lexer = get_lexer_by_name(node["lexer"])
+            except ClassNotFound:
+                node_lexer = get_lexer_by_name("text")
+            parts.append(highlight(node["code"].strip(chr(10)), node_lexer, formatter))
+        elif kind == "text" and node["text"].strip():
+            parts.append(f"<pre class=\"output\">{escape(node['text'].strip(chr(10)))}</pre>")
+    return HTML_PAGE.format(title=escape(document.title), code_css=formatter.get_style_defs(".highlight"), body="\n".join(parts))
+
+
+RENDERERS: Dict[str, Callable[[Document], Union[str, bytes]]] = {
+    "text": render_text,
+    "markdown": render_markdown,
+    "html": render_html,
+    "pdf": render_pdf,  # bytes, see helpers.pdf_writer
+}
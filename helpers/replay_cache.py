@@ -0,0 +1,115 @@
+# helpers/replay_cache.py
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Optional
+from rich.console import Console
+from rich.segment import Segment, Segments
+from .recording import RecordingScope
+
+DEFAULT_REPLAY_DIR = Path(__file__).resolve().parent.parent / ".cache" / "replay"
+
+
+class ReplayCache:
+    """
+    Stores the rendered segment stream of a topic on disk, keyed by its source fingerprint and the terminal width,
+    so revisiting the topic (in this or a later session) writes the stored output instead of running mod.main().
+    File layout: one pickled header dict followed by pickled chunks (lists of segments) until the end of the file.
+    A topic whose output must not come from an earlier run (clock, randomness, live environment, timings) sets
+    `REPLAY_CACHE = False` at module level: the menu, the prefetcher and the book then run it every time.
+    Args:
+        cache_dir (Path): folder where the replay files are kept
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_REPLAY_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, module: str, width: int)-> Path:
+        return self.cache_dir / f"{module}-{width}.replay"
+
+    def _open(self, module: str, fingerprint: str, width: int):
+        """Opens the replay file positioned after its header, or returns None when it is missing or stale."""
+        try:
+            f = open(self._path(module, width), "rb")
+        except OSError:
+            return None
+        try:
+            header = pickle.load(f)
+            if header.get("fingerprint") == fingerprint and header.get("width") == width:
+                return f
+        except Exception:
+            pass
+        f.close()
+        return None
+
+    def has(self, module: str, fingerprint: str, width: int)-> bool:
+        f = self._open(module, fingerprint, width)
+        if f is None:
+            return False
+        f.close()
+        return True
+
+    def iter_chunks(self, module: str, fingerprint: str, width: int)-> Optional[Iterator[List[Segment]]]:
+        """
+        Returns an iterator over the stored chunks of `module` (read one at a time), None when there is no valid entry.
+        Args:
+            module (str): dotted module name
+            fingerprint (str): current source fingerprint of the topic
+            width (int): width the output must have been rendered at
+        """
+        f = self._open(module, fingerprint, width)
+        if f is None:
+            return None
+        return self._read_chunks(f)
+
+    @staticmethod
+    def _read_chunks(f)-> Iterator[List[Segment]]:
+        with f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    break
+
+    def replay(self, module: str, fingerprint: str, console: Console)-> bool:
+        """
+        Writes the stored output of `module` to the console, returns False when there is no valid entry.
+        Args:
+            module (str): dotted module name
+            fingerprint (str): current source fingerprint of the topic
+            console (Console): console to replay into (its recording scope captures the replay as usual)
+        """
+        chunks = self.iter_chunks(module, fingerprint, console.width)
+        if chunks is None:
+            return False
+        for chunk in chunks:
+            console.print(Segments(chunk), end="")
+        return True
+
+    def store(self, module: str, fingerprint: str, width: int, scope: RecordingScope)-> None:
+        """
+        Saves everything recorded by `scope` as the replay of `module` at the given width.
+        Args:
+            module (str): dotted module name
+            fingerprint (str): source fingerprint the output was rendered from
+            width (int): width of the console the output was rendered at
+            scope (RecordingScope): closed scope that recorded the topic
+        """
+        if scope.dropped_count:
+            return  # part of the output was thrown away, a replay would be incomplete
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f"{module}-", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"fingerprint": fingerprint, "width": width}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                for chunk in scope.iter_chunks():
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self._path(module, width))
+        except Exception:
+            try:
+                os.remove(tmp_name)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,203 @@
+# helpers/search.py
+
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .catalog import PROJECT_ROOT, Catalog
+
+DEFAULT_INDEX_FILE = PROJECT_ROOT / ".cache" / "search_index.json"
+INDEX_FORMAT = 1
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0}
+# How much a prefix or fuzzy (one typo) match is worth compared to an exact term match
+MATCH_QUALITY = {"exact": 1.0, "prefix": 0.7, "fuzzy": 0.5}
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str)-> List[str]:
+    """Lower-cases the text and splits it into word tokens (letters, digits and underscores)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _deletes(term: str)-> Set[str]:
+    """All variants of `term` with one character removed, used for one-typo fuzzy matching."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def within_one_edit(a: str, b: str)-> bool:
+    """
+    True when `a` and `b` differ by at most one insertion, deletion, substitution or transposition of two
+    neighbouring characters (Damerau-Levenshtein distance <= 1).
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    if len(a) == len(b):
+        if a[start + 1:] == b[start + 1:]:
+            return True  # substitution
+        swapped = start + 1 < len(a) and a[start] == b[start + 1] and a[start + 1] == b[start]
+        return swapped and a[start + 2:] == b[start + 2:]  # transposition
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return shorter[start:] == longer[start + 1:]  # insertion / deletion
+
+
+def _node_terms(node: dict)-> Dict[str, float]:
+    terms: Dict[str, float] = {}
+    fields = {"title": node["title"], "tags": " ".join(node["tags"]), "description": node["description"]}
+    for field, text in fields.items():
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0.0) + FIELD_WEIGHTS[field]
+    return terms
+
+
+def _node_hash(node: dict)-> str:
+    content = json.dumps([node["title"], node["description"], node["tags"], node["path"], node["module"]])
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+class SearchIndex:
+    """
+    Inverted index over the title, tags and description of every catalog entry.
+    Supports exact, prefix and one-typo fuzzy term matching with weighted tf-idf ranking.
+    The per-entry terms are persisted, so when topics.json changes only the changed entries are re-indexed.
+    Args:
+        catalog (Catalog): compiled topic catalog to index
+        index_file (Path): where the index is stored, None to keep it in memory only
+    """
+
+    def __init__(self, catalog: Catalog, index_file: Optional[Path] = DEFAULT_INDEX_FILE):
+        self.catalog = catalog
+        self.index_file = Path(index_file) if index_file else None
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_hashes: Dict[str, str] = {}
+        self.reindexed: List[str] = []  # ids (re)indexed by the last update, tests check that updates are incremental
+        self._source_stamp = None
+        self._load()
+        self._update()
+        self._build_lookup_tables()
+
+    # ---------------------------------------------------------------------------------------------
+    # Building
+    # ---------------------------------------------------------------------------------------------
+    def _load(self)-> None:
+        if self.index_file is None or not self.index_file.exists():
+            return
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return
+        if data.get("format") == INDEX_FORMAT:
+            self.doc_terms = data["doc_terms"]
+            self.doc_hashes = data["doc_hashes"]
+            self._source_stamp = data.get("source_stamp")
+
+    def _update(self)-> None:
+        if self._source_stamp == self.catalog.source_stamp and self.doc_hashes:
+            return  # topics.json did not change since the index was saved
+        for node_id, node in self.catalog.nodes.items():
+            node_hash = _node_hash(node)
+            if self.doc_hashes.get(node_id) != node_hash:
+                self.doc_terms[node_id] = _node_terms(node)
+                self.doc_hashes[node_id] = node_hash
+                self.reindexed.append(node_id)
+        for node_id in list(self.doc_hashes):
+            if node_id not in self.catalog.nodes:
+                del self.doc_hashes[node_id]
+                self.doc_terms.pop(node_id, None)
+        self._source_stamp = self.catalog.source_stamp
+        self._save()
+
+    def _save(self)-> None:
+        if self.index_file is None:
+            return
+        data = {"format": INDEX_FORMAT, "source_stamp": self._source_stamp,
+                "doc_hashes": self.doc_hashes, "doc_terms": self.doc_terms}
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(data), encoding="utf-8")
+            tmp_file.replace(self.index_file)
+        except OSError:
+            pass
+
+    def _build_lookup_tables(self)-> None:
+        self.postings: Dict[str, Dict[str, float]] = {}
+        for node_id, terms in self.doc_terms.items():
+            for term, weight in terms.items():
+                self.postings.setdefault(term, {})[node_id] = weight
+        self.vocabulary: List[str] = sorted(self.postings)
+        self.idf: Dict[str, float] = {
+            term: math.log(1 + len(self.doc_terms) / len(docs)) for term, docs in self.postings.items()
+        }
+        self._delete_table: Dict[str, List[str]] = {}
+        for term in self.vocabulary:
+            if len(term) > 3:  # typos in very short words match almost anything
+                for variant in _deletes(term) | {term}:
+                    self._delete_table.setdefault(variant, []).append(term)
+
+    # ---------------------------------------------------------------------------------------------
+    # Querying
+    # ---------------------------------------------------------------------------------------------
+    def _prefix_terms(self, prefix: str)-> Iterable[str]:
+        vocabulary = self.vocabulary
+        for i in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            yield vocabulary[i]
+
+    def _fuzzy_terms(self, token: str)-> Set[str]:
+        if len(token) <= 3:
+            return set()
+        candidates: Set[str] = set()
+        for variant in _deletes(token) | {token}:
+            candidates.update(self._delete_table.get(variant, ()))
+        # one deletion on each side also pairs terms two edits apart ("loop" and "oops"), keep the real typos only
+        return {term for term in candidates if within_one_edit(token, term)}
+
+    def _expand(self, token: str)-> Dict[str, float]:
+        """Maps a query token to the index terms it matches and the quality of each match."""
+        matches: Dict[str, float] = {}
+        if token in self.postings:
+            matches[token] = MATCH_QUALITY["exact"]
+        if len(token) >= 2:
+            for term in self._prefix_terms(token):
+                matches.setdefault(term, MATCH_QUALITY["prefix"])
+        if not matches:
+            for term in self._fuzzy_terms(token):
+                matches.setdefault(term, MATCH_QUALITY["fuzzy"])
+        return matches
+
+    def search(self, query: str, limit: int = 10)-> List[Tuple[dict, float]]:
+        """
+        Returns up to `limit` (catalog node, score) pairs, best first.
+        Entries matching every query word rank above entries matching only some of them.
+        Args:
+            query (str): free text query, e.g. "lru cach" or "list comprehesion"
+            limit (int): maximum number of results
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        scores: Dict[str, float] = {}
+        matched: Dict[str, int] = {}
+        for token in tokens:
+            token_scores: Dict[str, float] = {}
+            for term, quality in self._expand(token).items():
+                idf = self.idf[term]
+                for node_id, weight in self.postings[term].items():
+                    score = weight * idf * quality
+                    if score > token_scores.get(node_id, 0.0):
+                        token_scores[node_id] = score
+            for node_id, score in token_scores.items():
+                scores[node_id] = scores.get(node_id, 0.0) + score
+                matched[node_id] = matched.get(node_id, 0) + 1
+        ranked = heapq.nlargest(limit, scores, key=lambda node_id: (matched[node_id], scores[node_id]))
+        return [(self.catalog.nodes[node_id], scores[node_id]) for node_id in ranked]
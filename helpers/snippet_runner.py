@@ -0,0 +1,411 @@
+# helpers/snippet_runner.py
+
+import atexit
+import collections
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+from .catalog import PROJECT_ROOT
+
+DEFAULT_SNIPPET_CACHE_DIR = PROJECT_ROOT / ".cache" / "snippets"
+SNIPPET_TIMEOUT = 10.0  # seconds a snippet may run before it is reported as timed out
+SNIPPET_CPU_LIMIT = 5.0  # seconds of CPU time, stops busy loops before the wall-clock timeout
+SNIPPET_MEMORY_LIMIT = 512 * 1024 * 1024  # bytes a snippet may allocate
+SNIPPET_OUTPUT_LIMIT = 100_000  # characters a snippet may print
+SNIPPET_PRELOAD = ["helpers", "re", "json", "csv", "functools", "datetime"]  # imported once by the template process
+
+
+def snippet_key(code: str)-> str:
+    """Cache key of a snippet: its source and the exact Python version that ran it."""
+    return hashlib.sha256(f"{sys.version}\0{code}".encode()).hexdigest()
+
+
+class OutputLimitExceeded(BaseException):
+    """Raised inside a snippet that prints more than its output limit (BaseException, so `except Exception` in the snippet lets it through)."""
+
+
+class _CappedOutput(io.StringIO):
+    """stdout/stderr of a snippet, both streams share one budget of characters (a one item list)."""
+
+    def __init__(self, budget: List[int]):
+        super().__init__()
+        self._budget = budget
+
+    def write(self, text: str)-> int:
+        if len(text) > self._budget[0]:
+            super().write(text[:self._budget[0]])
+            self._budget[0] = 0
+            raise OutputLimitExceeded()
+        self._budget[0] -= len(text)
+        return super().write(text)
+
+
+def execute_snippet(code: str, max_output: int = SNIPPET_OUTPUT_LIMIT)-> Dict:
+    """
+    Runs `code` as a small script in the current process and returns
+    {"stdout", "stderr", "status": "ok" | "error" | "memory_limit" | "output_limit", "error", "duration"}.
+    The snippet (dedented, lessons often indent it) gets its own globals, an empty stdin and a scratch working directory, an exception is
+    reported like the interpreter would (traceback on stderr). Meant to run inside a worker process.
+    Args:
+        code (str): source of the snippet
+        max_output (int): characters the snippet may print (stdout and stderr together), it is stopped past that
+    """
+    budget = [max_output]
+    stdout, stderr = _CappedOutput(budget), _CappedOutput(budget)
+    result = {"stdout": "", "stderr": "", "status": "ok", "error": "", "duration": 0.0}
+    failure = ""
+    try:
+        cwd = os.getcwd()
+    except FileNotFoundError:  # the worker was forked inside a topic's scratch folder, deleted since
+        cwd = tempfile.gettempdir()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="snippet_") as scratch_dir:
+        os.chdir(scratch_dir)
+        previous_stdin = sys.stdin
+        sys.stdin = io.StringIO("")  # a snippet asking for input() gets EOFError instead of hanging the worker
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exec(compile(textwrap.dedent(code), "<snippet>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                result.update(status="error", error=f"SystemExit: {e.code}")
+        except OutputLimitExceeded:
+            result.update(status="output_limit", error=f"printed more than {max_output} characters")
+        except MemoryError:
+            result.update(status="memory_limit", error="ran out of memory (MemoryError)")
+        except BaseException as e:
+            result.update(status="error", error=f"{type(e).__name__}: {e}")
+            failure = "".join(traceback.format_exception(type(e), e, e.__traceback__.tb_next))
+        finally:
+            sys.stdin = previous_stdin
+            os.chdir(cwd)
+    result["duration"] = time.perf_counter() - start
+    result["stdout"], result["stderr"] = stdout.getvalue(), stderr.getvalue() + failure
+    return result
+
+
+def apply_limits(cpu_limit: Optional[float], memory_limit: Optional[int])-> None:
+    """
+    Sets the resource limits of the current (snippet) process, None leaves a limit off. Does nothing where the
+    `resource` module is missing (Windows).
+    Past `cpu_limit` seconds of CPU time the kernel stops the process with SIGXCPU. `memory_limit` bytes are allowed on
+    top of the address space the process already uses, more makes allocations fail with MemoryError.
+    Args:
+        cpu_limit (float): seconds of CPU time
+        memory_limit (int): bytes of memory
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    if cpu_limit is not None:
+        seconds = max(1, math.ceil(cpu_limit))
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))  # SIGKILL one second later if SIGXCPU is ignored
+    if memory_limit is not None:
+        try:
+            with open("/proc/self/statm") as f:
+                in_use = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return  # without the current size a limit could stop the process before the snippet starts
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (in_use + memory_limit, hard))
+
+
+class SnippetCache:
+    """
+    Results of executed snippets on disk, one small json file per snippet_key(), so parallel exporters never
+    write the same file. A snippet is only executed again when its code or the Python version changes.
+    Args:
+        cache_dir (Path): folder of the result files
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_SNIPPET_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def get(self, code: str)-> Optional[Dict]:
+        try:
+            return json.loads((self.cache_dir / f"{snippet_key(code)}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, code: str, result: Dict)-> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{snippet_key(code)}.json"
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(result), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            pass  # not caching only costs a new run next time
+
+
+def _failure(status: str, error: str, duration: float = 0.0)-> Dict:
+    return {"stdout": "", "stderr": "", "status": status, "error": error, "duration": duration}
+
+
+def _run_request(request: Dict)-> Dict:
+    """Runs one request of the runner ({"code", "cpu_limit", "memory_limit", "max_output", ...}) in this process."""
+    apply_limits(request["cpu_limit"], request["memory_limit"])
+    return execute_snippet(request["code"], request["max_output"])
+
+
+def _fork_snippet(request: Dict)-> Tuple[int, int]:
+    """
+    Forks a child of the template that runs one snippet and writes its result (json) to a pipe. Returns (pid, read end).
+    The child leads its own process group, so whatever the snippet starts is killed along with it.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            os.setpgid(0, 0)
+            os.close(read_fd)
+            with open(write_fd, "wb") as f:
+                f.write(json.dumps(_run_request(request)).encode())
+            exit_code = 0
+        finally:
+            os._exit(exit_code)  # never returns into the template's loop, nothing of the template is cleaned up twice
+    os.close(write_fd)
+    return pid, read_fd
+
+
+def _exit_description(wait_status: int)-> str:
+    exit_code = os.waitstatus_to_exitcode(wait_status)
+    if exit_code < 0:
+        return f"killed by {signal.Signals(-exit_code).name}"
+    return f"exited with code {exit_code}"
+
+
+def serve(workers: int)-> None:
+    """
+    Main loop of the template process (python -m helpers.snippet_runner): the modules of SNIPPET_PRELOAD are
+    imported once, then every snippet received on stdin ({"id", "code", "timeout", "cpu_limit", "memory_limit",
+    "max_output"} json lines) runs in a clean child forked from this process, at most `workers` at a time.
+    A child still running after its "timeout" (wall clock) is killed, the other limits are enforced in the child.
+    Results ({"id", **execute_snippet() result}) are written to stdout in the order they finish, the status tells
+    which limit a snippet broke: "timeout", "cpu_limit", "memory_limit" or "output_limit".
+    Snippets may write to the real file descriptors, the protocol uses private copies and 0/1 point to /dev/null.
+    """
+    import selectors
+
+    for name in SNIPPET_PRELOAD:
+        importlib.import_module(name)
+    requests_fd, results = os.dup(0), os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    selector = selectors.DefaultSelector()
+    selector.register(requests_fd, selectors.EVENT_READ)
+    queue: Deque[Dict] = collections.deque()
+    running: Dict[int, Dict] = {}  # read end of the child's pipe -> {"id", "pid", "started", "deadline", "chunks", ...}
+    buffer = b""
+
+    def finish(fd: int, result: Optional[Dict] = None)-> None:
+        job = running.pop(fd)
+        selector.unregister(fd)
+        os.close(fd)
+        if result is not None:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(job["pid"], signal.SIGKILL)
+        _, wait_status = os.waitpid(job["pid"], 0)
+        if result is None:
+            duration = time.monotonic() - job["started"]
+            try:
+                result = json.loads(b"".join(job["chunks"]))
+            except ValueError:
+                if os.WIFSIGNALED(wait_status) and os.WTERMSIG(wait_status) == signal.SIGXCPU:
+                    result = _failure("cpu_limit", f"used more than {job['cpu_limit']:g}s of CPU time", duration)
+                else:
+                    result = _failure("crashed", f"snippet process {_exit_description(wait_status)}", duration)
+        results.write(json.dumps(dict(result, id=job["id"])).encode() + b"\n")
+        results.flush()
+
+    while True:
+        while queue and len(running) < workers:
+            request = queue.popleft()
+            pid, fd = _fork_snippet(request)
+            now = time.monotonic()
+            running[fd] = {"id": request["id"], "pid": pid, "started": now, "deadline": now + request["timeout"],
+                           "timeout": request["timeout"], "cpu_limit": request["cpu_limit"], "chunks": []}
+            selector.register(fd, selectors.EVENT_READ)
+        next_deadline = min((job["deadline"] for job in running.values()), default=None)
+        for key, _ in selector.select(None if next_deadline is None else max(0.0, next_deadline - time.monotonic())):
+            if key.fd == requests_fd:
+                data = os.read(requests_fd, 65536)
+                if not data:  # the runner closed the pipe (or is gone)
+                    for fd in list(running):
+                        finish(fd, _failure("crashed", "runner closed"))
+                    return
+                *lines, buffer = (buffer + data).split(b"\n")
+                queue.extend(json.loads(line) for line in lines if line)
+                continue
+            data = os.read(key.fd, 65536)
+            if data:
+                running[key.fd]["chunks"].append(data)
+            else:
+                finish(key.fd)
+        now = time.monotonic()
+        for fd, job in list(running.items()):
+            if job["deadline"] <= now:
+                finish(fd, _failure("timeout", f"snippet did not finish within {job['timeout']:g}s", job["timeout"]))
+
+
+class SnippetRunner:
+    """
+    Executes lesson snippets, each one in a clean process forked from a warm template interpreter
+    (started once with SNIPPET_PRELOAD already imported, see serve()), with results cached by code and Python version.
+    Every snippet runs under the limits below, one that breaks a limit is stopped and reported with the status
+    "timeout", "cpu_limit", "memory_limit" or "output_limit" while the others keep running.
+    On systems without os.fork every snippet gets a fresh interpreter instead.
+    Args:
+        workers (int): number of snippets running at the same time
+        timeout (float): seconds (wall clock) a snippet may run before it is killed
+        cache (SnippetCache): result cache, None to always execute
+        cpu_limit (float): seconds of CPU time a snippet may use, None for no limit
+        memory_limit (int): bytes a snippet may allocate, None for no limit
+        max_output (int): characters a snippet may print
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = SNIPPET_TIMEOUT, cache: Optional[SnippetCache] = None,
+                 cpu_limit: Optional[float] = SNIPPET_CPU_LIMIT, memory_limit: Optional[int] = SNIPPET_MEMORY_LIMIT,
+                 max_output: int = SNIPPET_OUTPUT_LIMIT):
+        self.workers = workers
+        self.timeout = timeout
+        self.cache = cache
+        self.limits = {"timeout": timeout, "cpu_limit": cpu_limit, "memory_limit": memory_limit, "max_output": max_output}
+        self.executed = 0  # snippets actually run, the others came from the cache
+        self._template: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _template_process(self)-> subprocess.Popen:
+        if self._template is None or self._template.poll() is not None:
+            self._template = subprocess.Popen(
+                [sys.executable, "-m", "helpers.snippet_runner", "--workers", str(self.workers)],
+                cwd=PROJECT_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        return self._template
+
+    def run(self, code: str)-> Dict:
+        """Result of execute_snippet() for `code`, from the cache when it ran before."""
+        return self.run_many([code])[0]
+
+    def run_many(self, codes: List[str])-> List[Dict]:
+        """
+        Runs several snippets at once, results in the same order as `codes`.
+        Results taken from the cache have "cached": True.
+        """
+        results: List[Optional[Dict]] = [self.cache.get(code) if self.cache else None for code in codes]
+        for result in results:
+            if result is not None:
+                result["cached"] = True
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            with self._lock:
+                run = self._run_forked if hasattr(os, "fork") else self._run_fresh
+                for i, result in zip(pending, run([codes[i] for i in pending])):
+                    results[i] = result
+                    if result["status"] in ("ok", "error"):
+                        self.executed += 1
+                        if self.cache is not None:
+                            self.cache.put(codes[i], result)
+        return results
+
+    def _run_forked(self, codes: List[str])-> List[Dict]:
+        template = self._template_process()
+        results: List[Optional[Dict]] = [None] * len(codes)
+        sent = 0
+
+        def send(count: int)-> int:
+            for i in range(sent, min(sent + count, len(codes))):
+                template.stdin.write(json.dumps(dict(self.limits, id=i, code=codes[i])).encode() + b"\n")
+            template.stdin.flush()
+            return min(sent + count, len(codes))
+
+        try:
+            sent = send(self.workers * 2)  # a small window keeps both pipes from filling up
+            for _ in codes:
+                line = template.stdout.readline()
+                if not line:
+                    raise BrokenPipeError("snippet template process exited")
+                result = json.loads(line)
+                results[result.pop("id")] = result
+                sent = send(1)
+        except (BrokenPipeError, ValueError) as e:
+            self._template = None
+            template.kill()
+            results = [result or _failure("crashed", str(e)) for result in results]
+        return results
+
+    def _run_fresh(self, codes: List[str])-> List[Dict]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        def run_one(code: str)-> Dict:
+            try:
+                completed = subprocess.run([sys.executable, "-m", "helpers.snippet_runner", "--once"], capture_output=True,
+                                           input=json.dumps(dict(self.limits, code=code)).encode(), timeout=self.timeout, cwd=PROJECT_ROOT)
+            except subprocess.TimeoutExpired:
+                return _failure("timeout", f"snippet did not finish within {self.timeout:g}s", self.timeout)
+            try:
+                return json.loads(completed.stdout)
+            except ValueError:
+                return _failure("crashed", f"snippet process exited with code {completed.returncode}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(run_one, codes))
+
+    def close(self)-> None:
+        with self._lock:
+            template, self._template = self._template, None
+        if template is not None:
+            template.stdin.close()  # the template kills what is still running and exits
+            template.wait()
+            template.stdout.close()
+
+
+_default_runner: Optional[SnippetRunner] = None
+_default_runner_lock = threading.Lock()
+
+
+def get_snippet_runner()-> SnippetRunner:
+    """Returns the process wide SnippetRunner (with the on-disk result cache), creating it on first call."""
+    global _default_runner
+    with _default_runner_lock:
+        if _default_runner is None:
+            _default_runner = SnippetRunner(cache=SnippetCache())
+            atexit.register(_default_runner.close)
+        return _default_runner
+
+
+def snippet_output(result: Dict)-> str:
+    """Text shown in the output panel for a snippet result: stdout, then stderr, then the failure if any."""
+    output = result["stdout"] + result["stderr"]
+    if result["status"] not in ("ok", "error"):  # stopped by a limit or crashed
+        output += f"[{result['status']}] {result['error']}\n"
+    return output.rstrip("\n")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="snippet template process, started by SnippetRunner")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--once", action="store_true", help="run the request read from stdin and print its result")
+    args = parser.parse_args()
+    if args.once:
+        print(json.dumps(_run_request(json.loads(sys.stdin.read()))))
+    else:
+        serve(args.workers)
@@ -0,0 +1,162 @@
+# helpers/snippet_verify.py
+
+import ast
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from .content_index import TOPICS_DIR
+from .display_utils import console, render_2d_table
+from .snippet_runner import (SNIPPET_CPU_LIMIT, SNIPPET_MEMORY_LIMIT, SNIPPET_TIMEOUT, SnippetCache, SnippetRunner,
+                             snippet_output)
+
+
+def _exact_text(node: ast.AST)-> Optional[str]:
+    """
+    Text of a string constant, a "..." + "..." concatenation or an f-string without placeholders.
+    Unlike content_index._literal_text nothing is dropped, so None for anything computed at run time.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr) and all(isinstance(part, ast.Constant) for part in node.values):
+        return "".join(part.value for part in node.values)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _exact_text(node.left), _exact_text(node.right)
+        if left is not None and right is not None:
+            return left + right
+    return None
+
+
+def extract_snippets(path: Path)-> List[Dict]:
+    """
+    Pulls the show_code_with_output(code, expected output) pairs out of a topic module with `ast`.
+    Returns [{"line", "code", "expected"}], "expected" is None when the output is computed by the topic.
+    Calls whose code is not a plain string are left out.
+    Args:
+        path (Path): source file of the topic module
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    snippets = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if name != "show_code_with_output":
+            continue
+        arguments = dict(zip(["code_str", "output_str"], node.args))
+        arguments.update({kw.arg: kw.value for kw in node.keywords if kw.arg in ("code_str", "output_str")})
+        code = _exact_text(arguments["code_str"]) if "code_str" in arguments else None
+        if code is None:
+            continue
+        expected = _exact_text(arguments["output_str"]) if "output_str" in arguments else None
+        snippets.append({"line": node.lineno, "code": code, "expected": expected})
+    return sorted(snippets, key=lambda snippet: snippet["line"])
+
+
+def normalize_output(text: str)-> List[str]:
+    """Lines of an output as compared by the verifier: trailing spaces and surrounding blank lines ignored."""
+    lines = [line.rstrip() for line in text.strip("\n").splitlines()]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _first_difference(expected: List[str], actual: List[str])-> str:
+    for number, (want, got) in enumerate(zip(expected, actual), start=1):
+        if want != got:
+            return f"line {number}: expected {want!r}, got {got!r}"
+    if len(expected) > len(actual):
+        return f"line {len(actual) + 1}: expected {expected[len(actual)]!r}, got nothing"
+    return f"line {len(expected) + 1}: unexpected {actual[len(expected)]!r}"
+
+
+def verify_snippets(topics_dir: Path = TOPICS_DIR, modules: Optional[List[str]] = None, jobs: Optional[int] = None,
+                    timeout: float = SNIPPET_TIMEOUT, use_cache: bool = True, cpu_limit: Optional[float] = SNIPPET_CPU_LIMIT,
+                    memory_limit: Optional[int] = SNIPPET_MEMORY_LIMIT)-> List[Dict]:
+    """
+    Runs every show_code_with_output snippet of the topics in parallel and compares what it prints with the output
+    written in the lesson. Snippets whose code did not change since the last run come from the snippet cache.
+    Returns one dict per snippet: {"module", "line", "status", "duration", "cached", "detail"} where status is
+    "ok", "mismatch", "error" (the snippet raised), "crashed", "unchecked" (ran fine, output computed by the topic)
+    or the limit the snippet broke: "timeout", "cpu_limit", "memory_limit", "output_limit".
+    Args:
+        topics_dir (Path): folder that holds the topic modules
+        modules (List[str]): only verify these dotted module names (or their packages), every topic when None
+        jobs (int): number of worker processes, defaults to the number of CPUs
+        timeout (float): seconds (wall clock) each snippet may run
+        use_cache (bool): False runs every snippet again
+        cpu_limit (float): seconds of CPU time each snippet may use
+        memory_limit (int): bytes each snippet may allocate
+    """
+    entries = []
+    root = Path(topics_dir).parent
+    for path in sorted(Path(topics_dir).rglob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        module = ".".join(path.relative_to(root).with_suffix("").parts)
+        if modules and not any(module == name or module.startswith(name + ".") for name in modules):
+            continue
+        try:
+            snippets = extract_snippets(path)
+        except SyntaxError as e:
+            entries.append({"module": module, "line": e.lineno or 0, "code": None, "expected": None, "error": f"SyntaxError: {e.msg}"})
+            continue
+        entries += [dict(snippet, module=module) for snippet in snippets]
+
+    runnable = [entry for entry in entries if entry["code"] is not None]
+    runner = SnippetRunner(workers=jobs or os.cpu_count() or 1, timeout=timeout, cache=SnippetCache() if use_cache else None,
+                           cpu_limit=cpu_limit, memory_limit=memory_limit)
+    try:
+        results = runner.run_many([entry["code"] for entry in runnable])
+    finally:
+        runner.close()
+
+    report = []
+    runnable_results = iter(results)
+    for entry in entries:
+        row = {"module": entry["module"], "line": entry["line"], "status": "error", "duration": 0.0, "cached": False,
+               "detail": entry.get("error", "")}
+        report.append(row)
+        if entry["code"] is None:
+            continue
+        result = next(runnable_results)
+        row.update(duration=result["duration"], cached=result.get("cached", False), status=result["status"], detail=result["error"])
+        if result["status"] != "ok":
+            continue
+        if entry["expected"] is None:
+            row["status"] = "unchecked"
+            continue
+        expected, actual = normalize_output(entry["expected"]), normalize_output(snippet_output(result))
+        if expected != actual:
+            row.update(status="mismatch", detail=_first_difference(expected, actual))
+    return report
+
+
+def print_verify_report(report: List[Dict], verbose: bool = False, slowest: int = 5)-> None:
+    """
+    Shows the snippets that failed (every snippet with verbose=True), the slowest ones and a summary line.
+    Args:
+        report (List[Dict]): rows returned by verify_snippets()
+        verbose (bool): list the snippets that passed as well
+        slowest (int): number of slowest snippets to list
+    """
+    failed = [row for row in report if row["status"] not in ("ok", "unchecked")]
+    shown = report if verbose else failed
+    if shown:
+        rows = [["Module", "Line", "Status", "Time (ms)", "Detail"]]
+        rows += [[row["module"], row["line"], row["status"], f"{row['duration'] * 1000:.1f}" + (" (cached)" if row["cached"] else ""),
+                  row["detail"]] for row in shown]
+        render_2d_table(rows, title="🧪 Snippet verification")
+    timed = sorted((row for row in report if row["duration"]), key=lambda row: row["duration"], reverse=True)[:slowest]
+    if timed and not verbose:
+        rows = [["Module", "Line", "Time (ms)"]]
+        rows += [[row["module"], row["line"], f"{row['duration'] * 1000:.1f}"] for row in timed]
+        render_2d_table(rows, title="🐢 Slowest snippets")
+    counts: Dict[str, int] = {}
+    for row in report:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    executed = sum(1 for row in report if not row["cached"])
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    color = "bold red" if failed else "bold bright_green"
+    console.print(f"[{color}]{len(report)} snippets: {summary}[/] [dim]({executed} executed, the others from the cache)[/]")
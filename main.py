@@ -1,9 +1,29 @@
-from helpers.display_utils import export_output_to_html, create_pdf_from_html
+from helpers import display_utils
+from helpers.display_utils import console, export_output_to_html, recording_scope
+from helpers.batch_export import EXPORT_TIMEOUT, export_all, get_notes_paths
+from helpers.book import DEFAULT_BOOK_PATH, build_book
+from helpers.catalog import Catalog
+from helpers.search import SearchIndex
+from helpers.content_index import ContentIndex
+from helpers.display_utils import render_2d_table
+from helpers.export_manifest import ExportManifest, compute_fingerprint, compute_source_fingerprint, find_module_file
+from helpers.replay_cache import ReplayCache
+from helpers.profiler import profile_topic
+from helpers.prefetch import TopicPrefetcher
+from helpers.export_queue import ExportQueue, manifest_lock, pdf_export_work
+from helpers.document import capture_document
+from helpers.renderers import RENDERERS
+from helpers.snippet_runner import SNIPPET_CPU_LIMIT, SNIPPET_MEMORY_LIMIT, SNIPPET_TIMEOUT
+from helpers.snippet_verify import print_verify_report, verify_snippets
 from rich.prompt import Confirm
 from pathlib import Path
 import importlib
-import asyncio
-import json
+import argparse
+import os
+import tempfile
+
+prefetcher = TopicPrefetcher()  # prepares the topics of the submenu on screen in the background
+export_queue = ExportQueue()  # PDF exports run here while the user keeps browsing
 
 def clear_screen():
     print("\n" + "-" * 60 + "\n")
@@ -11,64 +31,219 @@ def clear_screen():
 def pause():
     input("\nPress Enter to continue...")
 
-def handle_menu(level_name, items):
+def report_finished_exports():
+    for job in export_queue.pop_finished():
+        if job.status == "done":
+            print(f"✅ {job.description} of {job.module} is ready: {', '.join(job.artifacts.values())}")
+        else:
+            print(f"❌ {job.description} of {job.module} failed: {job.error}")
+
+def handle_menu(catalog, level_name, items):
     while True:
         clear_screen()
+        report_finished_exports()
         print(f"📚 {level_name}:")
         for i, item in enumerate(items, 1):
             print(f"{i}. {item['title']}")
         print(f"{len(items)+1}. 🔙 Go Back")
         print(f"{len(items)+2}. ❌ Exit")
+        if export_queue.jobs:
+            print(f"j. 📦 Export jobs ({export_queue.active_count} running or pending)")
+        prefetcher.start(items, console.width)
 
         choice = input("\nEnter your choice: ")
+        if choice.strip().lower() == "j" and export_queue.jobs:
+            report_finished_exports()
+            export_queue.print_status()
+            pause()
+            continue
         if choice.isdigit():
             choice = int(choice)
             if 1 <= choice <= len(items):
                 selected = items[choice - 1]
-                if "subtopics" in selected:
-                    handle_menu(selected["title"], selected["subtopics"])
-                elif "module" in selected:
+                if selected["children"]:
+                    prefetcher.cancel()  # leaving this submenu, its siblings are not the likely next pick anymore
+                    handle_menu(catalog, selected["title"], catalog.children(selected["id"]))
+                elif selected["module"]:
+                    scope = recording_scope(selected["module"])
                     try:
-                        mod = importlib.import_module(selected["module"])
-                        mod.main()
+                        if selected["issue"]:
+                            raise ModuleNotFoundError(selected["issue"])
+                        module_file = find_module_file(selected["module"])
+                        if module_file is None:
+                            raise ModuleNotFoundError(f"No module named '{selected['module']}'")
+                        source_fingerprint = compute_source_fingerprint(module_file)
+                        if display_utils.LIVE_SNIPPETS:
+                            source_fingerprint += ":live"  # executed outputs are replayed separately from the written ones
+                        replay_cache = ReplayCache()
+                        with scope:  # records only this topic, not everything viewed in the session
+                            # A topic seen before (same source, same terminal width) is replayed from disk
+                            replayed = replay_cache.replay(selected["module"], source_fingerprint, console)
+                            if not replayed:
+                                mod = importlib.import_module(selected["module"])
+                                mod.main()
+                        if not replayed and getattr(mod, "REPLAY_CACHE", True):
+                            replay_cache.store(selected["module"], source_fingerprint, console.width, scope)
 
                         if Confirm.ask("\n[bold yellow]Do you want to export this output to an HTML file?[/]"):
-                            if mod.__file__ is None:
-                                print(f"❌ Module {selected['module']} does not have a __file__ attribute.")
-                                pause()
-                                continue
-                            module_path = Path(mod.__file__)
-                            notes_dir = module_path.parent / "Notes"
-                            notes_dir.mkdir(parents=True, exist_ok=True)
-                            html_dir = notes_dir / "HTMLs"
-                            html_dir.mkdir(parents=True, exist_ok=True)
-                            module_name = module_path.stem  # Gets the filename without the .py extension
-                            html_filepath = html_dir / f"{module_name}.html"
-                            export_output_to_html("fruity", str(html_filepath))
+                            html_filepath, pdf_filepath = get_notes_paths(str(module_file))
+                            fingerprint = compute_fingerprint(module_file, "fruity", console.width,
+                                                              "live" if display_utils.LIVE_SNIPPETS else "")
+                            with manifest_lock:  # the export queue may be recording a PDF at the same time
+                                manifest = ExportManifest()
+                                exported = True
+                                if manifest.is_fresh(selected["module"], fingerprint, ["html"]):
+                                    print(f"✅ '{html_filepath}' is up to date, skipping HTML export.")
+                                else:
+                                    # None: the export failed (and said why), the file on disk is not this topic's output
+                                    exported = export_output_to_html("fruity", str(html_filepath), scope=scope) is not None
+                                    if exported:
+                                        manifest.record(selected["module"], fingerprint, {"html": str(html_filepath)})
+                                        manifest.save()
 
-                            if Confirm.ask("\n[bold yellow]The HTML file was created. Do you want to convert it to a PDF?[/]"):
-                                pdf_dir = notes_dir / "PDFs"
-                                pdf_dir.mkdir(parents=True, exist_ok=True)
-                                pdf_filepath = pdf_dir / f"{module_name}.pdf"
-                                asyncio.run(create_pdf_from_html(str(html_filepath), str(pdf_filepath)))
+                            if exported and Confirm.ask("\n[bold yellow]The HTML file was created. Do you want to convert it to a PDF?[/]"):
+                                if manifest.is_fresh(selected["module"], fingerprint, ["pdf"]):
+                                    print(f"✅ '{pdf_filepath}' is up to date, skipping PDF conversion.")
+                                elif any(job.module == selected["module"] and job.status in ("pending", "running") for job in export_queue.jobs):
+                                    print("⏳ A PDF export of this topic is already queued.")
+                                else:
+                                    # Printing runs in the background, the result shows up the next time a menu is drawn
+                                    export_queue.submit(selected["module"], "PDF", pdf_export_work(html_filepath, pdf_filepath), fingerprint)
+                                    print("📦 PDF export queued, keep browsing ('j' in the menu shows the export jobs).")
                     except Exception as e:
                         print(f"❌ Failed to run {selected['module']}: {e}")
                         pause()
+                    finally:
+                        scope.close()
                 else:
                     print("⚠️ No valid subtopic/module found.")
             elif choice == len(items)+1:
+                prefetcher.cancel()
                 return
             elif choice == len(items)+2:
+                prefetcher.cancel()
+                if export_queue.active_count:
+                    print(f"⏳ Waiting for {export_queue.active_count} export job(s) to finish...")
+                    export_queue.wait()
+                    report_finished_exports()
                 print("👋 Exiting... Bye!")
                 exit()
         else:
             print("❗ Invalid input.")
             pause()
 
-def main():
-    with open("topics.json", "r") as f:
-        menu = json.load(f)
-    handle_menu("Python Topics....", menu)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Python learning library")
+    parser.add_argument("--live-snippets", action="store_true", help="run the code examples and show their real output")
+    commands = parser.add_subparsers(dest="command")
+    export_parser = commands.add_parser("export-all", help="export HTML/PDF notes of every topic without prompts")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    export_parser.add_argument("--theme", default="fruity", help="terminal theme used for the HTML export")
+    export_parser.add_argument("--no-pdf", action="store_true", help="only write the HTML files")
+    export_parser.add_argument("--force", action="store_true", help="export every topic even if its notes are up to date")
+    export_parser.add_argument("--compact", action="store_true", help="short class names and one shared stylesheet per theme (topics/Notes/css)")
+    export_parser.add_argument("--gzip", action="store_true", help="also write pre-compressed .html.gz files")
+    export_parser.add_argument("--pdf-engine", choices=["chromium", "builtin"], default="chromium",
+                               help="chromium: print the HTML with Playwright, builtin: fast browser-free PDF (falls back to chromium)")
+    export_parser.add_argument("--timeout", type=float, default=EXPORT_TIMEOUT, help=f"seconds each topic may take (default: {EXPORT_TIMEOUT:g})")
+    search_parser = commands.add_parser("search", help="search topic titles, descriptions and tags")
+    search_parser.add_argument("query", nargs="+", help="words to look for, prefixes and small typos are fine")
+    search_parser.add_argument("-n", "--limit", type=int, default=10, help="maximum number of results (default: 10)")
+    search_parser.add_argument("-c", "--content", action="store_true", help='search inside the lessons (headings, notes, code), "quote" for a phrase')
+    commands.add_parser("check-catalog", help="validate that every module listed in topics.json resolves to a file")
+    profile_parser = commands.add_parser("profile", help="time repeated renders of a topic and show render cache statistics")
+    profile_parser.add_argument("module", help="dotted module name, e.g. topics.OOPS.metaclasses")
+    profile_parser.add_argument("-n", "--repeat", type=int, default=3, help="number of renders (default: 3)")
+    book_parser = commands.add_parser("book", help="build one HTML/PDF handout with every topic and a table of contents")
+    book_parser.add_argument("-o", "--output", default=str(DEFAULT_BOOK_PATH), help="HTML file to write, the PDF is written next to it")
+    book_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes for topics not rendered yet")
+    book_parser.add_argument("--theme", default="fruity", help="terminal theme used for the book")
+    book_parser.add_argument("--no-pdf", action="store_true", help="only write the HTML file")
+    render_parser = commands.add_parser("render", help="render a topic to plain text, Markdown, semantic HTML or a browser-free PDF")
+    render_parser.add_argument("module", help="dotted module name, e.g. topics.OOPS.metaclasses")
+    render_parser.add_argument("-f", "--format", choices=sorted(RENDERERS), default="markdown", help="output format (default: markdown)")
+    render_parser.add_argument("-o", "--output", default=None, help="file to write, prints to the terminal when omitted")
+    verify_parser = commands.add_parser("verify-snippets", help="run the code examples and compare them with the outputs written in the lessons")
+    verify_parser.add_argument("modules", nargs="*", help="dotted module or package names (default: every topic)")
+    verify_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    verify_parser.add_argument("--timeout", type=float, default=SNIPPET_TIMEOUT, help=f"seconds each snippet may run (default: {SNIPPET_TIMEOUT:g})")
+    verify_parser.add_argument("--cpu-limit", type=float, default=SNIPPET_CPU_LIMIT, help=f"seconds of CPU time per snippet (default: {SNIPPET_CPU_LIMIT:g})")
+    verify_parser.add_argument("--memory-limit", type=int, default=SNIPPET_MEMORY_LIMIT // 2**20, help="MB each snippet may allocate (default: %(default)s)")
+    verify_parser.add_argument("--no-cache", action="store_true", help="run every snippet again, not only the changed ones")
+    verify_parser.add_argument("-v", "--verbose", action="store_true", help="list the snippets that passed as well")
+    return parser.parse_args(argv)
+
+def render_topic(module, output_format, output=None):
+    """Runs a topic with the display helpers captured into a document and renders it with one of the backends."""
+    project_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="topic_render_") as scratch_dir:
+        os.chdir(scratch_dir)  # demo files created by the topic must not land in the project
+        try:
+            with capture_document(title=module) as document:
+                importlib.import_module(module).main()
+        finally:
+            os.chdir(project_dir)
+    content = RENDERERS[output_format](document)
+    if output is None:
+        if isinstance(content, bytes):
+            print("❗ Binary formats need an output file (-o).")
+        else:
+            print(content)
+        return
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        Path(output).write_bytes(content)
+    else:
+        Path(output).write_text(content, encoding="utf-8")
+    print(f"✅ '{output}' written.")
+
+def main(argv=None):
+    args = parse_args(argv)
+    display_utils.LIVE_SNIPPETS = args.live_snippets
+    if args.command == "export-all":
+        export_all("topics.json", jobs=args.jobs, theme_name=args.theme, make_pdf=not args.no_pdf, force=args.force,
+                   compact=args.compact, gzip=args.gzip, pdf_engine=args.pdf_engine, live_snippets=args.live_snippets,
+                   timeout=args.timeout)
+        return
+    if args.command == "profile":
+        profile_topic(args.module, repeat=args.repeat)
+        return
+    if args.command == "book":
+        build_book("topics.json", output=args.output, theme_name=args.theme, jobs=args.jobs, make_pdf=not args.no_pdf)
+        return
+    if args.command == "render":
+        render_topic(args.module, args.format, args.output)
+        return
+    if args.command == "verify-snippets":
+        report = verify_snippets(modules=args.modules, jobs=args.jobs, timeout=args.timeout, use_cache=not args.no_cache,
+                                 cpu_limit=args.cpu_limit, memory_limit=args.memory_limit * 2**20)
+        print_verify_report(report, verbose=args.verbose)
+        exit(1 if any(row["status"] not in ("ok", "unchecked") for row in report) else 0)
+    catalog = Catalog("topics.json")
+    if args.command == "check-catalog":
+        for issue in catalog.issues:
+            print(f"❌ {issue}")
+        print(f"{len(catalog.nodes)} entries, {len(catalog.issues)} issue(s).")
+        exit(1 if catalog.issues else 0)
+    if args.command == "search" and args.content:
+        hits = ContentIndex().search(" ".join(args.query), limit=args.limit)
+        rows = [["Matches", "Module", "Section", "Snippet"]]
+        rows += [[hit["count"], hit["module"], hit["heading"], hit["snippet"]] for hit in hits]
+        if hits:
+            render_2d_table(rows, title=f"🔍 Lessons mentioning '{' '.join(args.query)}'")
+        else:
+            print(f"No lesson mentions '{' '.join(args.query)}'.")
+        return
+    if args.command == "search":
+        results = SearchIndex(catalog).search(" ".join(args.query), limit=args.limit)
+        rows = [["Score", "Topic", "Module"]]
+        rows += [[f"{score:.2f}", node["path"], node["module"] or "-"] for node, score in results]
+        if results:
+            render_2d_table(rows, title=f"🔍 Results for '{' '.join(args.query)}'")
+        else:
+            print(f"No topic matches '{' '.join(args.query)}'.")
+        return
+    handle_menu(catalog, "Python Topics....", catalog.children())
 
 if __name__ == "__main__":
     main()
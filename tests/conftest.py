@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import sys
+from pathlib import Path
+
+# the helpers package and the topics are imported from the project root, as main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,81 @@
+# tests/test_browser_pool.py
+
+from helpers import browser_pool
+from helpers.browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self, browsers):
+        self.browsers = browsers
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+async def double(page, value):
+    return value * 2
+
+
+def test_browser_is_launched_once_and_reused(monkeypatch):
+    browsers = []
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: FakePlaywright(browsers))
+    pool = BrowserPool(max_pages=2)
+    try:
+        assert [pool.submit(double, n).result(5) for n in range(5)] == [0, 2, 4, 6, 8]
+        assert pool.launch_count == 1
+        assert len(browsers) == 1
+    finally:
+        pool.close()
+
+
+def test_crashed_browser_is_relaunched(monkeypatch):
+    browsers = []
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: FakePlaywright(browsers))
+    pool = BrowserPool()
+    try:
+        pool.submit(double, 1).result(5)
+        crashed = browsers[0]
+        crashed.connected = False
+        crashed.handlers["disconnected"](crashed)
+        assert pool.submit(double, 2).result(5) == 4
+        assert pool.launch_count == 2
+    finally:
+        pool.close()
@@ -0,0 +1,29 @@
+# tests/test_content_index.py
+
+import os
+from helpers.content_index import ContentIndex
+
+TOPIC = '''
+from helpers.display_utils import *
+
+def main():
+    print_sub_heading("1. {title}")
+    display_note("{note}")
+'''
+
+
+def test_only_changed_files_are_reindexed(tmp_path):
+    topics_dir = tmp_path / "topics"
+    topics_dir.mkdir()
+    (topics_dir / "first.py").write_text(TOPIC.format(title="Loops", note="for and while"), encoding="utf-8")
+    (topics_dir / "second.py").write_text(TOPIC.format(title="Tuples", note="immutable"), encoding="utf-8")
+    index_file = tmp_path / "content_index.json"
+
+    assert sorted(ContentIndex(topics_dir, index_file).reindexed) == ["topics/first.py", "topics/second.py"]
+    assert ContentIndex(topics_dir, index_file).reindexed == []
+
+    second = topics_dir / "second.py"
+    second.write_text(TOPIC.format(title="Tuples", note="packing and unpacking"), encoding="utf-8")
+    stat = second.stat()
+    os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # coarse mtime clocks
+    assert ContentIndex(topics_dir, index_file).reindexed == ["topics/second.py"]
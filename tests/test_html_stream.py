@@ -0,0 +1,23 @@
+# tests/test_html_stream.py
+
+import io
+from rich.segment import ControlType, Segment
+from rich.style import Style
+from helpers.html_stream import StreamingHtmlWriter
+
+
+def test_segment_count_counts_merged_segments():
+    bold, red = Style(bold=True), Style(color="red")
+    output = io.StringIO()
+    with StreamingHtmlWriter(output) as writer:
+        writer.write([Segment("a", bold), Segment("b", bold), Segment("c", red), Segment("\n")])
+    assert writer.segment_count == 3  # "ab" in bold, "c" in red, the newline
+    assert "ab</span>" in output.getvalue()
+
+
+def test_control_segments_are_not_written():
+    output = io.StringIO()
+    with StreamingHtmlWriter(output) as writer:
+        writer.write([Segment("\x1b[?25l", None, [(ControlType.HIDE_CURSOR,)]), Segment("hello"), Segment("\n")])
+    assert "\x1b" not in output.getvalue()
+    assert "hello" in output.getvalue()
@@ -0,0 +1,19 @@
+# tests/test_pdf_writer.py
+
+import pytest
+from helpers.document import Document
+from helpers.pdf_writer import render_pdf
+
+
+@pytest.mark.parametrize("data", [[], [[]], [[], []]])
+def test_empty_tables_render(data):
+    document = Document("empty")
+    document.append({"kind": "table", "title": "Nothing here", "data": data, "inner_border": False})
+    assert render_pdf(document).startswith(b"%PDF")
+
+
+def test_wide_table_with_narrow_columns_renders():
+    header = ["x"] * 30
+    document = Document("wide")
+    document.append({"kind": "table", "title": "Many columns", "data": [header, ["1"] * 30], "inner_border": True})
+    assert render_pdf(document).startswith(b"%PDF")
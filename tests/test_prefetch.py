@@ -0,0 +1,31 @@
+# tests/test_prefetch.py
+
+import sys
+from helpers import display_utils
+from helpers.catalog import PROJECT_ROOT, Catalog
+from helpers.export_manifest import compute_source_fingerprint
+from helpers.prefetch import TopicPrefetcher, allows_replay
+from helpers.replay_cache import ReplayCache
+
+MODULE = "topics.Collection.tuple.tuple_basics"  # prints a section at import time
+
+
+def test_prefetching_a_topic_writes_nothing_to_the_console(tmp_path, capsys):
+    node = Catalog(str(PROJECT_ROOT / "topics.json"), cache_file=None).by_module(MODULE)
+    recorded = len(display_utils.console._record_buffer)
+    prefetcher = TopicPrefetcher(cache_dir=tmp_path)
+    prefetcher.start([node], 100)
+    prefetcher._thread.join(60)
+
+    assert prefetcher.prefetched == [MODULE]
+    assert capsys.readouterr() == ("", "")
+    assert len(display_utils.console._record_buffer) == recorded
+    assert MODULE not in sys.modules  # imported by the child process only, opening the topic runs it in full
+    fingerprint = compute_source_fingerprint(PROJECT_ROOT / node["file"])
+    assert ReplayCache(tmp_path).has(MODULE, fingerprint, 100)
+
+
+def test_replay_flag_is_read_without_importing():
+    assert not allows_replay(PROJECT_ROOT / "topics" / "Modules_and_packages" / "random_module.py")
+    assert allows_replay(PROJECT_ROOT / "topics" / "Collection" / "tuple" / "tuple_basics.py")
+    assert "topics.Modules_and_packages.random_module" not in sys.modules
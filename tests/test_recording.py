@@ -0,0 +1,30 @@
+# tests/test_recording.py
+
+import io
+from rich.console import Console
+from helpers.recording import RecordingScope
+
+
+def test_segment_count_includes_spilled_segments(tmp_path):
+    console = Console(record=True, file=io.StringIO(), width=80)
+    scope = RecordingScope("spill", console, max_segments=10, spill_dir=str(tmp_path), capture_print=False)
+    try:
+        with scope:
+            for n in range(50):
+                console.print(f"line {n}")
+        assert scope.spilled_count > 0
+        assert scope.segment_count == sum(len(chunk) for chunk in scope.iter_chunks())
+        assert "line 0" in "".join(segment.text for chunk in scope.iter_chunks() for segment in chunk)
+    finally:
+        scope.close()
+
+
+def test_dropped_segments_are_not_counted():
+    console = Console(record=True, file=io.StringIO(), width=80)
+    scope = RecordingScope("drop", console, max_segments=10, spill_to_disk=False, capture_print=False)
+    with scope:
+        for n in range(50):
+            console.print(f"line {n}")
+    assert scope.dropped_count > 0
+    assert scope.segment_count == sum(len(chunk) for chunk in scope.iter_chunks())
+    scope.close()
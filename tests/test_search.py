@@ -0,0 +1,37 @@
+# tests/test_search.py
+
+from helpers.catalog import PROJECT_ROOT, Catalog
+from helpers.search import SearchIndex, within_one_edit
+
+
+def make_catalog():
+    return Catalog(str(PROJECT_ROOT / "topics.json"), cache_file=None)
+
+
+def test_only_changed_entries_are_reindexed(tmp_path):
+    index_file = tmp_path / "search_index.json"
+    catalog = make_catalog()
+    assert sorted(SearchIndex(catalog, index_file).reindexed) == sorted(catalog.nodes)
+    assert SearchIndex(make_catalog(), index_file).reindexed == []
+
+    changed = make_catalog()
+    node_id = next(iter(changed.nodes))
+    changed.nodes[node_id]["title"] += " renamed"
+    changed.source_stamp = [0, 0]  # as if topics.json had been edited
+    assert SearchIndex(changed, index_file).reindexed == [node_id]
+
+
+def test_fuzzy_match_allows_one_typo_only():
+    index = SearchIndex(make_catalog(), index_file=None)
+    assert "oops" not in index._fuzzy_terms("loop")  # a substitution plus a transposition away
+    assert all(node["title"] != "OOPs Concepts" for node, _ in index.search("loop"))
+    assert "decorators" in index._fuzzy_terms("decoartors")
+    assert "tuple" in index._fuzzy_terms("tupel")
+
+
+def test_within_one_edit():
+    assert within_one_edit("list", "lits")  # transposition
+    assert within_one_edit("loop", "loops") and within_one_edit("loops", "loop")
+    assert within_one_edit("loop", "leop")
+    assert not within_one_edit("loop", "oops")
+    assert not within_one_edit("abcd", "badc")
@@ -3,6 +3,7 @@
 from helpers.display_utils import *
 import json
 import os
+from rich.syntax import Syntax
 
 def main():
     print_heading("Handling JSON Files")
@@ -1,4 +1,8 @@
 from helpers.display_utils import *
+from helpers.benchmark import compare_timings
+from functools import lru_cache
+
+REPLAY_CACHE = False  # timings are measured on screen, see helpers.benchmark
 
 def main():
     print_heading("functools Module in Python")
@@ -38,6 +42,19 @@ print(fib(10))  # 55
 
     display_note("Since Python 3.9, you can also use @cache for unlimited-size caching.", "example")
 
+    def fib_plain(n):
+        return n if n < 2 else fib_plain(n-1) + fib_plain(n-2)
+
+    @lru_cache(maxsize=None)
+    def fib_cached(n):
+        return n if n < 2 else fib_cached(n-1) + fib_cached(n-2)
+
+    display_note("Measured on this machine: the cache is cleared before every call, so each call computes fib(n) once.", "info")
+    compare_timings({
+        "fib(n) without cache": fib_plain,
+        "fib(n) with @lru_cache": lambda n: (fib_cached.cache_clear(), fib_cached(n)),
+    }, sizes=[10, 15, 20], title="⏱️ fib(n) with and without @lru_cache")
+
     # -------------------------------------------------------------------------------
     # 2. functools.wraps
     # -------------------------------------------------------------------------------
@@ -1,4 +1,5 @@
 from helpers.display_utils import *
+from helpers.memory import compare_sizes, compare_peak_memory
 
 def main():
     print_heading("Generators in Python")
@@ -172,6 +173,16 @@ gen.close()         # End
 - Use generators when you only need to process one item at a time, especially for very large data.
     """)
 
+    display_note("Measured on this machine with 100,000 squares: the generator holds no values, only its paused state.", "info")
+    compare_sizes({
+        "[x*x for x in range(n)]": [x*x for x in range(10**5)],
+        "(x*x for x in range(n))": (x*x for x in range(10**5)),
+    }, title="🧠 List comprehension vs generator expression")
+    compare_peak_memory({
+        "sum([x*x for x in range(n)])": lambda: sum([x*x for x in range(10**5)]),
+        "sum(x*x for x in range(n))": lambda: sum(x*x for x in range(10**5)),
+    }, title="🧠 Peak memory of sum() over each")
+
     # -------------------------------------------------------------------------------
     # 8. Best Practices and Summary
     # -------------------------------------------------------------------------------
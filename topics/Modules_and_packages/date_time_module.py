@@ -3,6 +3,8 @@
 from helpers.display_utils import *
 import datetime
 
+REPLAY_CACHE = False  # prints the current date and time
+
 def main():
     print_heading("The `datetime` Module: Handling Dates and Times")
     imp_note_points("""
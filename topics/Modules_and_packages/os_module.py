@@ -3,6 +3,8 @@
 from helpers.display_utils import *
 import os
 
+REPLAY_CACHE = False  # prints the working directory and environment variables of this process
+
 def main():
     print_heading("The `os` Module: System & Process Management")
     imp_note_points("""
@@ -3,6 +3,8 @@
 from helpers.display_utils import *
 import random
 
+REPLAY_CACHE = False  # new random numbers on every run
+
 def main():
     print_heading("The `random` Module: Pseudo-Random Numbers")
     imp_note_points("""